@@ -2,12 +2,38 @@
 
 import mimetypes
 from pathlib import Path
+from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from src.common.exceptions.notion_exceptions import NotionFileError
 from src.core.config import get_settings
 
+# (connect, read) timeout in seconds for every request made by this module
+_REQUEST_TIMEOUT = (5, 30)
+
+
+def _create_http_session() -> requests.Session:
+    """Create a pooled session that keeps TLS connections to Notion (API and file CDN) warm.
+
+    Idempotent requests (GET, PUT, ...) are retried with back-off on connection
+    errors and on rate-limit / server errors; uploads (POST, PATCH) are not.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=64,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by all NotionFileService instances; requests.Session is safe for concurrent use here
+_HTTP_SESSION = _create_http_session()
+
 
 class NotionFileService:
     """Service for handling file operations with Notion."""
@@ -38,13 +64,14 @@ class NotionFileService:
             # The Direct Upload flow expects a call to the /file_uploads endpoint.
             payload = {"filename": file_name, "content_type": mime_type}
 
-            resp = requests.post(
+            resp = _HTTP_SESSION.post(
                 "https://api.notion.com/v1/file_uploads",
                 headers={
                     "Authorization": f"Bearer {self.api_key}",
                     "Notion-Version": "2022-06-28",
                 },
                 json=payload,
+                timeout=_REQUEST_TIMEOUT,
             )
             resp.raise_for_status()
             data = resp.json()
@@ -66,25 +93,59 @@ class NotionFileService:
         try:
             with open(file_path, "rb") as f:
                 files = {"file": (file_path.name, f, mime_type)}
-                resp = requests.post(
+                resp = _HTTP_SESSION.post(
                     upload_url,
                     headers={
                         "Authorization": f"Bearer {self.api_key}",
                         "Notion-Version": "2022-06-28",
                     },
                     files=files,
+                    timeout=_REQUEST_TIMEOUT,
                 )
                 resp.raise_for_status()
         except Exception as e:
             raise NotionFileError(f"Failed to upload file contents: {str(e)}") from e
 
-    async def upload_file(self, file_path: str | Path, page_id: str, property_name: str) -> None:
+    async def upload_bytes_contents(self, upload_url: str, data: bytes, file_name: str, mime_type: str) -> None:
+        """Upload in-memory file contents to Notion.
+
+        Args:
+            upload_url: The URL to upload the file to.
+            data: The raw file contents.
+            file_name: The file name reported to Notion.
+            mime_type: The MIME type of the file.
+
+        Raises:
+            NotionFileError: If there's an error uploading the file.
+        """
+        try:
+            resp = _HTTP_SESSION.post(
+                upload_url,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Notion-Version": "2022-06-28",
+                },
+                files={"file": (file_name, data, mime_type)},
+                timeout=_REQUEST_TIMEOUT,
+            )
+            resp.raise_for_status()
+        except Exception as e:
+            raise NotionFileError(f"Failed to upload file contents: {str(e)}") from e
+
+    async def upload_file(
+        self, file_path: str | Path, page_id: str, property_name: str, replace_existing: bool = False
+    ) -> dict[str, Any]:
         """Upload a file to a Notion page property.
 
         Args:
             file_path: The path to the file to upload.
             page_id: The ID of the page to upload to.
             property_name: The name of the property to upload to.
+            replace_existing: Overwrite the files already stored in the property instead of appending.
+                Skips the request that fetches the current files.
+
+        Returns:
+            The updated page object as returned by the Notion API.
 
         Raises:
             NotionFileError: If there's an error uploading the file.
@@ -93,48 +154,91 @@ class NotionFileService:
         if not file_path.exists() or not file_path.is_file():
             raise NotionFileError(f"File does not exist: {file_path}")
 
-        mime_type, _ = mimetypes.guess_type(str(file_path))
-        if not mime_type:
-            mime_type = "application/octet-stream"
+        mime_type = self._guess_mime_type(file_path.name)
 
         try:
             upload_id, upload_url = await self.create_file_upload_object(file_path.name, mime_type)
 
             await self.upload_file_contents(upload_url, file_path, mime_type)
 
-            # Retrieve current files for the property so we can append the newly uploaded file.
-            existing_files = await self.get_existing_files(page_id, property_name)
+            return await self._attach_file_upload(upload_id, file_path.name, page_id, property_name, replace_existing)
+        except Exception as e:
+            raise NotionFileError(f"Failed to upload file: {str(e)}") from e
+
+    async def upload_bytes(
+        self, data: bytes, file_name: str, page_id: str, property_name: str, replace_existing: bool = False
+    ) -> dict[str, Any]:
+        """Upload in-memory content as a file to a Notion page property, without touching the disk.
 
-            # Append the new file to existing ones (if any)
-            updated_files = existing_files + [
-                {
-                    "type": "file_upload",
-                    "file_upload": {"id": upload_id},
-                    "name": file_path.name,
-                }
-            ]
+        Args:
+            data: The raw file contents.
+            file_name: The file name shown in Notion (its extension determines the MIME type).
+            page_id: The ID of the page to upload to.
+            property_name: The name of the property to upload to.
+            replace_existing: Overwrite the files already stored in the property instead of appending.
 
-            # Attach the combined file list back to the page property
-            resp = requests.patch(
-                f"https://api.notion.com/v1/pages/{page_id}",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Notion-Version": "2022-06-28",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "properties": {
-                        property_name: {
-                            "type": "files",
-                            "files": updated_files,
-                        }
-                    }
-                },
-            )
-            resp.raise_for_status()
+        Returns:
+            The updated page object as returned by the Notion API.
+
+        Raises:
+            NotionFileError: If there's an error uploading the file.
+        """
+        mime_type = self._guess_mime_type(file_name)
+
+        try:
+            upload_id, upload_url = await self.create_file_upload_object(file_name, mime_type)
+
+            await self.upload_bytes_contents(upload_url, data, file_name, mime_type)
+
+            return await self._attach_file_upload(upload_id, file_name, page_id, property_name, replace_existing)
         except Exception as e:
             raise NotionFileError(f"Failed to upload file: {str(e)}") from e
 
+    @staticmethod
+    def _guess_mime_type(file_name: str) -> str:
+        """Guess the MIME type from a file name, defaulting to a binary stream."""
+        mime_type, _ = mimetypes.guess_type(file_name)
+        return mime_type or "application/octet-stream"
+
+    async def _attach_file_upload(
+        self, upload_id: str, file_name: str, page_id: str, property_name: str, replace_existing: bool
+    ) -> dict[str, Any]:
+        """Attach a completed file upload to a page property and return the updated page."""
+        # Retrieve current files for the property so we can append the newly uploaded file.
+        existing_files = [] if replace_existing else await self.get_existing_files(page_id, property_name)
+
+        # Append the new file to existing ones (if any)
+        updated_files = existing_files + [
+            {
+                "type": "file_upload",
+                "file_upload": {"id": upload_id},
+                "name": file_name,
+            }
+        ]
+
+        # Attach the combined file list back to the page property
+        resp = _HTTP_SESSION.patch(
+            f"https://api.notion.com/v1/pages/{page_id}",
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Notion-Version": "2022-06-28",
+                "Content-Type": "application/json",
+            },
+            json={
+                "properties": {
+                    property_name: {
+                        "type": "files",
+                        "files": updated_files,
+                    }
+                }
+            },
+            timeout=_REQUEST_TIMEOUT,
+        )
+        resp.raise_for_status()
+        # The PATCH response already carries the updated page
+        page_data: dict[str, Any] = resp.json()
+        return page_data
+
     async def get_existing_files(self, page_id: str, property_name: str) -> list[dict]:
         """Retrieve the current list of files stored in the given page property.
 
@@ -148,12 +252,13 @@ class NotionFileService:
             A list of file objects as returned by the Notion API (can be empty).
         """
         try:
-            resp = requests.get(
+            resp = _HTTP_SESSION.get(
                 f"https://api.notion.com/v1/pages/{page_id}",
                 headers={
                     "Authorization": f"Bearer {self.api_key}",
                     "Notion-Version": "2022-06-28",
                 },
+                timeout=_REQUEST_TIMEOUT,
             )
             resp.raise_for_status()
             page_data = resp.json()
@@ -181,7 +286,7 @@ class NotionFileService:
             NotionFileError: If there's an error downloading the file.
         """
         try:
-            resp = requests.get(file_url)
+            resp = _HTTP_SESSION.get(file_url, timeout=_REQUEST_TIMEOUT)
             resp.raise_for_status()
             return resp.content
         except Exception as e:
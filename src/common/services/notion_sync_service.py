@@ -37,6 +37,8 @@ class NotionSyncService:
         # command when you need to create or repair the database schema.
 
     _cached_database: NotionDatabase | None = None  # class-level cache per instance
+    # (database, its properties dumped to plain dicts) - dumped once per fetched database
+    _cached_database_schema: tuple[NotionDatabase, dict[str, Any]] | None = None
 
     async def get_database(self, database_id: str) -> NotionDatabase:
         """Get a Notion database.
@@ -111,13 +113,16 @@ class NotionSyncService:
         except Exception as e:
             raise NotionAPIError(f"Failed to create page: {str(e)}") from e
 
-    async def upload_file_to_page(self, file_path: str, page_id: str, property_name: str) -> NotionPage:
+    async def upload_file_to_page(
+        self, file_path: str, page_id: str, property_name: str, replace_existing: bool = False
+    ) -> NotionPage:
         """Upload a file to a Notion page property.
 
         Args:
             file_path: The path to the file to upload.
             page_id: The ID of the page to upload to.
             property_name: The name of the property to upload to.
+            replace_existing: Overwrite the files already stored in the property instead of appending.
 
         Returns:
             The updated Notion page.
@@ -127,11 +132,13 @@ class NotionSyncService:
             NotionFileError: If there's an error with the file operation.
         """
         try:
-            # Delegate the heavy lifting to the file service.
-            await self.file_service.upload_file(file_path, page_id, property_name)
-
-            # Return the refreshed page to the caller so they get the latest state.
-            return await self.get_page(page_id)
+            # Delegate the heavy lifting to the file service. Its final PATCH
+            # returns the updated page, so no extra round-trip is needed to
+            # hand the latest state back to the caller.
+            raw_result = await self.file_service.upload_file(
+                file_path, page_id, property_name, replace_existing=replace_existing
+            )
+            return NotionPage.model_validate(raw_result)
         except Exception as e:
             if isinstance(e, NotionFileError):
                 raise
@@ -274,11 +281,13 @@ class NotionSyncService:
 
         The schema is fetched once and cached in the instance.  Subsequent
         calls return the cached representation unless *force_refresh* is
-        True.
+        True.  The result is the raw-dict form consumed by the extractor and
+        ``schema_utils`` (no Pydantic models); it is shared between calls and
+        must be treated as read-only.
         """
 
         if self._cached_database is not None and not force_refresh:
-            return {name: prop.model_dump(exclude_none=True) for name, prop in self._cached_database.properties.items()}
+            return self._dump_database_schema(self._cached_database)
 
         async def _inner(db_id: str) -> NotionDatabase:
             return await self.get_database(db_id)
@@ -316,7 +325,14 @@ class NotionSyncService:
 
         self.api_service = NotionAPIService()
 
-        return {name: prop.model_dump(exclude_none=True) for name, prop in self._cached_database.properties.items()}
+        return self._dump_database_schema(self._cached_database)
+
+    def _dump_database_schema(self, database: NotionDatabase) -> dict[str, Any]:
+        """Dump the properties of *database* to plain dicts, once per fetched database."""
+        if self._cached_database_schema is None or self._cached_database_schema[0] is not database:
+            schema = {name: prop.model_dump(exclude_none=True) for name, prop in database.properties.items()}
+            self._cached_database_schema = (database, schema)
+        return self._cached_database_schema[1]
 
     async def _ensure_required_properties(self, database_id: str | None = None) -> None:
         """Ensure that the database contains all required properties.
@@ -436,25 +452,7 @@ class NotionSyncService:
         # 3. Apply updates (if any) and refresh local cache
         # ------------------------------------------------------------------
         if update_payload:
-            try:
-                self._cached_database = await self.api_service.update_database(db_id, update_payload)
-            except Exception:  # pragma: no cover
-                raise
-
-    def _ensure_required_properties_sync(self) -> None:
-        """Ensure that the database contains all required properties.
-
-        This helper fetches the current database schema and compares it
-        against the *REQUIRED_DATABASE_PROPERTIES* declared in the global
-        ``Settings`` instance.  Any missing properties are created via the
-        Notion *Update a database* endpoint so that subsequent queries or
-        page creations that rely on those fields succeed.
-        """
-
-        async def _inner() -> None:
-            await self._ensure_required_properties()
-
-        asyncio.run(_inner())
+            self._cached_database = await self.api_service.update_database(db_id, update_payload)
 
     async def is_database_verified(self, database_id: str | None = None) -> bool:
         """Return *True* if the database already contains all required properties.
@@ -4,18 +4,53 @@ OpenAI Service module for interacting with various language model providers.
 This module provides service implementations for different LLM providers, starting with OpenAI.
 """
 
-import json
+import asyncio
+import functools
+import importlib.util
 from typing import Any
 
 import openai
+import orjson
 from openai import NOT_GIVEN
 from openai.types.responses import (
+    Response,
     ResponseInputItemParam,
     ResponseInputParam,
     ResponseTextConfigParam,
     WebSearchToolParam,
 )
 
+from src.core.config import get_settings
+
+# Transient failures retried by get_structured_response_async (the SDK's retries are disabled)
+_RETRYABLE_ASYNC_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+@functools.cache
+def _http2_available() -> bool:
+    """Return True when the optional ``h2`` package (``speedups`` extra) is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+async def _close_stale_async_client(client: openai.AsyncOpenAI, client_loop: asyncio.AbstractEventLoop | None) -> None:
+    """Close an ``AsyncOpenAI`` client created on another event loop.
+
+    Its connections belong to that loop: the close is scheduled there while it still runs. Once the
+    loop is closed its transports cannot be closed cleanly any more and are left to be collected.
+    """
+    if client_loop is not None and client_loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.close(), client_loop)
+        return
+    try:
+        await client.close()
+    except RuntimeError:  # "Event loop is closed"
+        pass
+
 
 class OpenAIService:
     """Service for interacting with OpenAI's Responses API.
@@ -28,17 +63,44 @@ class OpenAIService:
         api_key: The OpenAI API key for authentication.
     """
 
-    def __init__(self, api_key: str, temperature: float = 0.7) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        temperature: float = 0.7,
+        max_retries: int | None = None,
+        retry_delay_seconds: float | None = None,
+        timeout_seconds: float | None = None,
+    ) -> None:
         """Initialize the OpenAI service with the provided API key and temperature.
 
         Args:
             api_key: The OpenAI API key for authentication.
             temperature: The temperature for model responses (default: 0.7).
+            max_retries: Attempts made by the async helpers on rate-limit / timeout errors.
+                Defaults to ``settings.OPENAI_MAX_RETRIES``.
+            retry_delay_seconds: Initial back-off delay, doubled after every failed attempt.
+                Defaults to ``settings.API_RETRY_DELAY_SECONDS``.
+            timeout_seconds: Per-request timeout of the async client. Defaults to
+                ``settings.OPENAI_TIMEOUT_SECONDS``.
         """
         self.client = openai.OpenAI(api_key=api_key)
         self.response_id: str | None = None
         self.temperature: float = temperature
 
+        settings = get_settings()
+        self.max_retries = settings.OPENAI_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_delay_seconds = (
+            settings.API_RETRY_DELAY_SECONDS if retry_delay_seconds is None else retry_delay_seconds
+        )
+        self.timeout_seconds = settings.OPENAI_TIMEOUT_SECONDS if timeout_seconds is None else timeout_seconds
+
+        # The async client is created lazily and re-created per event loop: its
+        # internal httpx pool is bound to the loop that first used it, so
+        # reusing it across ``asyncio.run`` calls fails with "Event loop is closed".
+        self._api_key = api_key
+        self._async_client: openai.AsyncOpenAI | None = None
+        self._async_client_loop: asyncio.AbstractEventLoop | None = None
+
     def _create_messages(self, sys_prompt: str | None, user_prompt: str | None) -> ResponseInputParam:
         """Create a list of messages for the OpenAI API.
 
@@ -61,13 +123,17 @@ class OpenAIService:
             messages.append({"role": "user", "content": user_prompt})
         return messages
 
-    def get_response(self, sys_prompt: str | None, user_prompt: str | None, model_name: str) -> str:
+    def get_response(
+        self, sys_prompt: str | None, user_prompt: str | None, model_name: str, use_history: bool = True
+    ) -> str:
         """Get a response from the specified OpenAI model using the Responses API.
 
         Args:
             sys_prompt: The system prompt to send to the model.
             user_prompt: The user prompt to send to the model.
             model_name: The name of the OpenAI model to use.
+            use_history: Whether to chain the request to the previous response. Standalone requests
+                (False) neither send nor replace the conversation state.
 
         Returns:
             The model's response as a string.
@@ -85,13 +151,14 @@ class OpenAIService:
                 input=messages,
                 model=model_name,
                 temperature=self.temperature if model_name != "o4-mini" else NOT_GIVEN,
-                previous_response_id=self.response_id if self.response_id else NOT_GIVEN,
+                previous_response_id=self.response_id if self.response_id and use_history else NOT_GIVEN,
             )
 
             if not hasattr(response, "id"):
                 raise ValueError(f"Unexpected response type: {type(response)}")
 
-            self.response_id = response.id
+            if use_history:
+                self.response_id = response.id
 
             # Check for error in response
             if response.error:
@@ -115,6 +182,7 @@ class OpenAIService:
         model_name: str,
         schema: dict[str, Any],
         use_web_search: bool = False,
+        use_history: bool = True,
     ) -> dict[str, Any]:
         """Get a structured response from the specified OpenAI model using the Responses API.
 
@@ -124,6 +192,9 @@ class OpenAIService:
             model_name: The name of the OpenAI model to use.
             schema: OpenAI JSON Schema defining the expected output structure.
             use_web_search: Whether to enable web search tools (defaults to False).
+            use_history: Whether to chain the request to the previous response. Standalone requests
+                (False) neither send nor replace the conversation state, so they are safe to make
+                from several threads at once.
 
         Returns:
             Structured data extracted from the model's response.
@@ -139,14 +210,7 @@ class OpenAIService:
         messages = self._create_messages(sys_prompt, user_prompt)
 
         # Create the text configuration for structured output
-        text_config: ResponseTextConfigParam = {
-            "format": {
-                "type": "json_schema",
-                "name": "structured_response",
-                "strict": True,
-                "schema": schema_copy,
-            }
-        }
+        text_config = self._create_text_config(schema_copy)
 
         try:
             # Prepare tools parameter
@@ -162,7 +226,7 @@ class OpenAIService:
                 model=model_name,
                 text=text_config,
                 temperature=self.temperature,
-                previous_response_id=self.response_id if self.response_id else NOT_GIVEN,
+                previous_response_id=self.response_id if self.response_id and use_history else NOT_GIVEN,
                 tools=tools,
             )
 
@@ -170,16 +234,203 @@ class OpenAIService:
                 raise ValueError(f"Unexpected response type: {type(response)}")
 
             # Store the response ID for the next interaction
-            self.response_id = response.id
-
-            # Check for error in response
-            if response.error:
-                error_msg = f"API Error: {getattr(response.error, 'message', 'Unknown error')}"
-                error_code = getattr(response.error, "code", None)
-                if error_code:
-                    error_msg += f" (code: {error_code})"
-                raise ValueError(error_msg)
+            if use_history:
+                self.response_id = response.id
 
-            return dict(json.loads(response.output_text)) if response.output_text else {}
-        except json.JSONDecodeError as e:
+            return self._parse_structured_output(response)
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Failed to parse structured output as JSON: {str(e)}") from e
+
+    async def get_structured_response_async(
+        self,
+        sys_prompt: str | None,
+        user_prompt: str | None,
+        model_name: str,
+        schema: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Async counterpart of :meth:`get_structured_response` meant for concurrent callers.
+
+        Unlike the synchronous variant the request is *not* chained to
+        ``previous_response_id`` – concurrent calls would otherwise race on the
+        shared conversation state.  Rate-limit (429), timeout, connection and
+        5xx errors are retried up to ``max_retries`` times with exponential
+        back-off; the SDK's own retries are disabled so that this loop is the
+        only one.
+
+        Args:
+            sys_prompt: The system prompt to send to the model.
+            user_prompt: The user prompt to send to the model.
+            model_name: The name of the OpenAI model to use.
+            schema: OpenAI JSON Schema defining the expected output structure.
+
+        Returns:
+            Structured data extracted from the model's response.
+
+        Raises:
+            ValueError: If both prompts are None, retries are exhausted or the output cannot be parsed.
+        """
+        messages = self._create_messages(sys_prompt, user_prompt)
+        text_config = self._create_text_config(schema.copy())
+        async_client = await self._get_async_client()
+
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                response = await async_client.responses.create(
+                    input=messages,
+                    model=model_name,
+                    text=text_config,
+                    temperature=self.temperature,
+                )
+                return self._parse_structured_output(response)
+            except _RETRYABLE_ASYNC_ERRORS as e:
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self.retry_delay_seconds * (2 ** (attempt - 1)))
+                    continue
+                raise ValueError(f"Error getting structured response after {attempt} attempts: {str(e)}") from e
+            except orjson.JSONDecodeError as e:
+                raise ValueError(f"Failed to parse structured output as JSON: {str(e)}") from e
+
+        # Only reachable when max_retries < 1 – added to satisfy type checkers.
+        raise ValueError("Error getting structured response: no attempts were made")
+
+    def create_structured_batch(self, sys_prompts: dict[str, str], model_name: str, schema: dict[str, Any]) -> str:
+        """Submit structured-output requests to the Batch API.
+
+        Batched requests are billed at a discount and run against a separate
+        rate-limit pool, at the cost of completing asynchronously (within 24h).
+        Use :meth:`get_structured_batch_results` to collect the outputs.
+
+        Args:
+            sys_prompts: System prompts keyed by a caller-chosen custom ID, one request each.
+            model_name: The name of the OpenAI model to use.
+            schema: OpenAI JSON Schema defining the expected output structure.
+
+        Returns:
+            The ID of the created batch.
+
+        Raises:
+            ValueError: If no prompts are given or the batch cannot be created.
+        """
+        if not sys_prompts:
+            raise ValueError("At least one prompt must be provided for a batch.")
+
+        text_config = self._create_text_config(schema.copy())
+        lines = b"\n".join(
+            orjson.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/responses",
+                    "body": {
+                        "input": self._create_messages(sys_prompt, None),
+                        "model": model_name,
+                        "text": text_config,
+                        "temperature": self.temperature,
+                    },
+                }
+            )
+            for custom_id, sys_prompt in sys_prompts.items()
+        )
+
+        try:
+            input_file = self.client.files.create(file=("batch_input.jsonl", lines), purpose="batch")
+            batch = self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/responses",
+                completion_window="24h",
+            )
+        except openai.OpenAIError as e:
+            raise ValueError(f"Error creating batch: {str(e)}") from e
+
+        return batch.id
+
+    def get_structured_batch_results(self, batch_id: str) -> dict[str, dict[str, Any]] | None:
+        """Collect the outputs of a batch created by :meth:`create_structured_batch`.
+
+        Args:
+            batch_id: The ID returned by :meth:`create_structured_batch`.
+
+        Returns:
+            Structured outputs keyed by custom ID, or None while the batch is still running.
+            Requests that failed inside the batch are left out.
+
+        Raises:
+            ValueError: If the batch failed, expired or was cancelled, or cannot be retrieved.
+        """
+        try:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in ("failed", "expired", "cancelling", "cancelled"):
+                raise ValueError(f"Batch {batch_id} ended with status '{batch.status}'")
+            if batch.status != "completed":
+                return None
+            if not batch.output_file_id:
+                return {}
+            content = self.client.files.content(batch.output_file_id).text
+        except openai.OpenAIError as e:
+            raise ValueError(f"Error retrieving batch {batch_id}: {str(e)}") from e
+
+        results: dict[str, dict[str, Any]] = {}
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                continue
+            try:
+                results[record["custom_id"]] = self._parse_structured_output(Response.model_validate(response["body"]))
+            except (ValueError, orjson.JSONDecodeError):
+                continue
+        return results
+
+    async def _get_async_client(self) -> openai.AsyncOpenAI:
+        """Return an ``AsyncOpenAI`` client bound to the currently running event loop.
+
+        A client left over from another event loop is closed before it is replaced.
+        """
+        running_loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not running_loop:
+            if self._async_client is not None:
+                await _close_stale_async_client(self._async_client, self._async_client_loop)
+            # With h2 installed, concurrent requests are multiplexed over one HTTP/2
+            # connection instead of each opening (and TLS-handshaking) its own.
+            self._async_client = openai.AsyncOpenAI(
+                api_key=self._api_key,
+                max_retries=0,
+                timeout=self.timeout_seconds,
+                http_client=openai.DefaultAsyncHttpxClient(http2=_http2_available()),
+            )
+            self._async_client_loop = running_loop
+        return self._async_client
+
+    def _create_text_config(self, schema: dict[str, Any]) -> ResponseTextConfigParam:
+        """Build the ``text`` parameter requesting strict JSON-schema structured output."""
+        return {
+            "format": {
+                "type": "json_schema",
+                "name": "structured_response",
+                "strict": True,
+                "schema": schema,
+            }
+        }
+
+    def _parse_structured_output(self, response: Response) -> dict[str, Any]:
+        """Validate a Responses API result and decode its JSON output.
+
+        Raises:
+            ValueError: If the response carries an API error or the output is not a JSON object.
+            orjson.JSONDecodeError: If the output is not valid JSON.
+        """
+        if response.error:
+            error_msg = f"API Error: {getattr(response.error, 'message', 'Unknown error')}"
+            error_code = getattr(response.error, "code", None)
+            if error_code:
+                error_msg += f" (code: {error_code})"
+            raise ValueError(error_msg)
+
+        if not response.output_text:
+            return {}
+        data = orjson.loads(response.output_text)
+        if not isinstance(data, dict):
+            raise ValueError(f"Structured output is not a JSON object: {type(data).__name__}")
+        return data
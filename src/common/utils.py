@@ -2,8 +2,16 @@
 Utility functions for common file I/O operations.
 """
 
+import asyncio
+import importlib
+from collections.abc import Coroutine
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from types import ModuleType
+from typing import Any, TypeVar
+
+T = TypeVar("T")
 
 
 def read_file_content(file_path: str | Path) -> str:
@@ -29,6 +37,28 @@ def read_file_content(file_path: str | Path) -> str:
         raise OSError(f"Error reading file {path}: {e}") from e
 
 
+@lru_cache(maxsize=16)
+def read_prompt_template(file_path: str | Path) -> str:
+    """
+    Read a prompt template file, keeping its content in memory for later calls.
+
+    Prompt templates are static for the lifetime of the process, so each one is
+    read from disk only once. Call ``read_prompt_template.cache_clear()`` to pick
+    up edits.
+
+    Args:
+        file_path: Path to the prompt template. Can be a string or Path object.
+
+    Returns:
+        str: The content of the template.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        IOError: If there is an error reading the file.
+    """
+    return read_file_content(file_path)
+
+
 def write_file_content(file_path: str | Path, content: str) -> None:
     """
     Write content to a file, creating parent directories if they don't exist.
@@ -49,6 +79,13 @@ def write_file_content(file_path: str | Path, content: str) -> None:
         raise OSError(f"Error writing to file {path}: {e}") from e
 
 
+def current_prompt_date() -> str:
+    """
+    Return today's date in the format substituted for {{CURRENT_DATE}} (e.g. "June 01, 2025").
+    """
+    return datetime.now().strftime("%B %d, %Y")
+
+
 def replace_prompt_placeholders(prompt_template: str, **kwargs: str) -> str:
     """
     Replace placeholders in a prompt template with dynamic values.
@@ -68,7 +105,7 @@ def replace_prompt_placeholders(prompt_template: str, **kwargs: str) -> str:
         "Today is December 15, 2024. Process https://example.com."
     """
     # Get current date in a readable format
-    current_date = datetime.now().strftime("%B %d, %Y")
+    current_date = current_prompt_date()
 
     # Start with the template
     result = prompt_template
@@ -82,3 +119,61 @@ def replace_prompt_placeholders(prompt_template: str, **kwargs: str) -> str:
         result = result.replace(placeholder, value)
 
     return result
+
+
+def split_prompt_template(prompt_template: str, placeholder: str, **kwargs: str) -> tuple[str, str]:
+    """
+    Pre-render a prompt template around a single dynamic placeholder.
+
+    Every other placeholder (including {{CURRENT_DATE}}) is replaced once, and the
+    result is split into the text before and after ``{{placeholder}}``, so callers
+    can build each prompt with a plain ``prefix + value + suffix`` concatenation.
+
+    Args:
+        prompt_template: The prompt template string with placeholders.
+        placeholder: Name of the placeholder left for the caller to fill in (e.g. "CONTENT").
+        **kwargs: Additional key-value pairs to replace in the template.
+
+    Returns:
+        tuple[str, str]: The rendered text before and after the placeholder. If the
+        placeholder does not occur, the whole rendered template and an empty suffix.
+
+    Example:
+        >>> prefix, suffix = split_prompt_template("Read: {{CONTENT}} on {{URL}}", "CONTENT", URL="x.com")
+        >>> prefix + "some text" + suffix
+        "Read: some text on x.com"
+    """
+    prefix, _, suffix = prompt_template.partition(f"{{{{{placeholder}}}}}")
+    return replace_prompt_placeholders(prefix, **kwargs), replace_prompt_placeholders(suffix, **kwargs)
+
+
+@lru_cache(maxsize=1)
+def _load_uvloop() -> ModuleType | None:
+    """Return the uvloop module when the optional ``speedups`` extra is installed."""
+    try:
+        return importlib.import_module("uvloop")
+    except ImportError:
+        return None
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Create a new event loop, backed by uvloop when it is installed.
+
+    uvloop (libuv, written in C) schedules callbacks and socket I/O noticeably
+    faster than the default selector loop; without it this is ``asyncio.new_event_loop()``.
+    """
+    uvloop = _load_uvloop()
+    loop: asyncio.AbstractEventLoop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    return loop
+
+
+def run_async(main: Coroutine[Any, Any, T]) -> T:  # noqa: UP047 - PEP 695 syntax needs Python 3.12
+    """
+    Run a coroutine to completion like ``asyncio.run``, on a uvloop loop when available.
+    """
+    uvloop = _load_uvloop()
+    if uvloop is None:
+        return asyncio.run(main)
+    result: T = uvloop.run(main)
+    return result
@@ -67,6 +67,8 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     PDFLATEX_COMMAND: str = "pdflatex"
     LATEXDIFF_COMMAND: str = "latexdiff"
+    # Parent of the per-compile pdflatex build directories (/dev/shm if writable, else the system temp directory)
+    LATEX_BUILD_DIRECTORY: Path | None = None
     DEFAULT_MODEL_NAME: str = "gpt-4.1"
     TEST_NOTION_PAGE_ID: str | None = None
 
@@ -74,6 +76,10 @@ class Settings(BaseSettings):
     OPENAI_TEMPERATURE: float = 0.7
     OPENAI_MAX_RETRIES: int = 3
     OPENAI_TIMEOUT_SECONDS: int = 30
+    # Upper bound on in-flight crawl + LLM pipelines for batch extraction
+    EXTRACTION_MAX_CONCURRENCY: int = 10
+    # Job descriptions sent per OpenAI call by extract_metadata_from_job_descriptions
+    EXTRACTION_BATCH_SIZE: int = 5
 
     # Notion special properties
     JOB_URL_PROPERTY_NAME: str = "Job URL"
@@ -105,6 +111,9 @@ class Settings(BaseSettings):
     CRAWL4AI_USER_AGENT: str = "Job-Finder-Assistant/1.0"
     CRAWL4AI_MAX_RETRIES: int = 3
     CRAWL4AI_RETRY_DELAY_SECONDS: int = 2
+    # Browser profile directory; when set, crawls reuse a persistent context
+    # (cookies, HTTP cache) instead of starting from a cold, throw-away one.
+    CRAWL4AI_USER_DATA_DIR: Path | None = None
     MAX_CONTENT_LENGTH_CHARS: int = 500000
 
     # Cache settings
@@ -129,12 +138,16 @@ class Settings(BaseSettings):
     # File paths and directories
     PROMPTS_DIRECTORY: Path = Path("data/prompts")
     EXTRACT_METADATA: str = "extract_metadata.txt"
+    # Prompt for extracting several job postings in one OpenAI call
+    EXTRACT_METADATA_BATCH: str = "extract_metadata_batch.txt"
     TAILOR_RESUME_SYSTEM_PROMPT_FILENAME: str = "tailor_resume_sys.txt"
     TAILOR_RESUME_USER_PROMPT_FILENAME: str = "tailor_resume_user.txt"
     TAILORING_RULES_FILENAME: str = "tailoring_rules_default.txt"
     # Prompt filename for reducing an overlong resume PDF to 1 page
     # Uses `data/prompts/reduce_resume_user.txt` (context-only user prompt)
     PDF_REDUCTION_PROMPT_FILENAME: str = "reduce_resume_user.txt"
+    # Small prompt asking for a corrected diff block when a SEARCH block does not match
+    DIFF_REPAIR_PROMPT_FILENAME: str = "repair_diff_user.txt"
 
     # Performance and reliability settings
     API_KEY_MIN_LENGTH: int = 10
@@ -145,8 +158,12 @@ class Settings(BaseSettings):
 
     # Retry settings for diff application
     DIFF_MAX_RETRIES: int = 3
+    # Model used to repair a single unmatched SEARCH block between full tailoring attempts
+    DIFF_REPAIR_MODEL_NAME: str = "gpt-4.1-mini"
     PDF_REDUCTION_MAX_RETRIES: int = 10  # Max attempts to reduce PDF Length
     GOAL_PAGE_COUNT: int = 1
+    # A second page with less text than this is fixed by enlarging page 1, without the LLM
+    TRIVIAL_OVERFLOW_MAX_CHARS: int = 80
 
     # File Names
     TAILORED_RESUME_STEM: str = "tailored_resume"
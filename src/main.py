@@ -3,7 +3,8 @@ import asyncio
 import sys
 from typing import Any
 
-from src.common.services import NotionSyncService, OpenAIService
+from src.common.services import NotionAPIService, NotionSyncService, OpenAIService
+from src.common.utils import run_async
 from src.core.config import Settings
 from src.core.logger import logger
 from src.metadata_extraction import ExtractorService
@@ -122,10 +123,6 @@ async def handle_extract_command(args: argparse.Namespace, settings: Settings) -
     # The synchronous schema check performed during initialisation closes
     # its temporary event-loop, leaving the internal client orphaned.  Create
     # a *fresh* API service bound to the current asynchronous loop.
-    from src.common.services.notion_api_service import (
-        NotionAPIService,  # local import to avoid cycle
-    )
-
     notion_service.api_service = NotionAPIService()
 
     extractor_service = ExtractorService(
@@ -140,15 +137,10 @@ async def handle_extract_command(args: argparse.Namespace, settings: Settings) -
     database_schema = notion_service.get_database_schema()
 
     # ------------------------------------------------------------------
-    # 3. Extract metadata using the (potentially blocking) extractor – keep
-    #    this call sync since it may use OpenAI in a blocking fashion.
+    # 3. Extract metadata on the current event loop (crawl + async OpenAI).
     # ------------------------------------------------------------------
     try:
-        # Run the (blocking) extraction inside a worker thread so that we
-        # do not attempt to start a new event-loop while the current one
-        # is already running.
-        extracted_metadata = await asyncio.to_thread(
-            extractor_service.extract_metadata_from_job_url,
+        extracted_metadata = await extractor_service.extract_metadata_from_job_url_async(
             args.job_url,
             database_schema,
             args.model,
@@ -156,6 +148,8 @@ async def handle_extract_command(args: argparse.Namespace, settings: Settings) -
     except Exception as e:
         logger.error(f"Extraction failed: {str(e)}")
         sys.exit(1)
+    finally:
+        await asyncio.to_thread(extractor_service.close)
 
     # ------------------------------------------------------------------
     # 4. Persist results back to Notion
@@ -186,7 +180,9 @@ async def handle_tailor_resume_command(args: argparse.Namespace, settings: Setti
         logger.error("Notion database schema is incomplete or invalid. Run `python src/main.py init` first.")
         sys.exit(2)
 
-    pdf_compiler = PDFCompiler()
+    pdf_compiler = PDFCompiler(
+        format_directory=settings.CACHE_DIRECTORY / "latex_formats" if settings.CACHE_ENABLED else None
+    )
     latex_service = LatexService(pdf_compiler=pdf_compiler, settings=settings)
     tailor_service = TailorService(
         openai_service=openai_service,
@@ -250,12 +246,12 @@ def main() -> None:
 
         # Dispatch based on selected agent & command
         if args.agent == "resume" and args.command == "extract":
-            job_metadata = asyncio.run(handle_extract_command(args, settings))
+            job_metadata = run_async(handle_extract_command(args, settings))
             display_results(job_metadata)
         elif args.agent == "resume" and args.command == "tailor":
-            asyncio.run(handle_tailor_resume_command(args, settings))
+            run_async(handle_tailor_resume_command(args, settings))
         elif args.agent == "resume" and args.command == "init":
-            asyncio.run(handle_init_command(settings))
+            run_async(handle_init_command(settings))
         else:
             print("Error: Invalid command. Use --help for usage information.")
             sys.exit(1)
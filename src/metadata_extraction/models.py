@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class NotionSelectOption(BaseModel):
     """Represents an option in a Notion 'select', 'multi_select', or 'status' property schema."""
 
+    # The most numerous object in a schema; frozen so instances are hashable and immutable
+    model_config = ConfigDict(frozen=True)
+
     id: str | None = Field(default=None, description="ID of the option.")
     name: str = Field(description="Name of the option.")
     color: str | None = Field(default=None, description="Color of the option.")
@@ -29,8 +32,7 @@ class NotionPropertySchemaTypeDetails(BaseModel):
     # relation_database_id: str | None = Field(default=None, description="Database ID for relation properties.")
     # rollup: dict[str, Any] | None = Field(default=None, description="Rollup configuration.")
 
-    class Config:
-        extra = "allow"  # Allow other type-specific fields
+    model_config = ConfigDict(extra="allow")  # Allow other type-specific fields
 
 
 class NotionPropertySchema(BaseModel):
@@ -64,8 +66,8 @@ class NotionPropertySchema(BaseModel):
     # ... other property types like 'rich_text', 'title', 'number', 'date', etc., have their own specific structures
     # which are often just an empty object `{}` if no further config is needed for that type.
 
-    class Config:
-        extra = "allow"  # Allow fields like 'rich_text', 'title', etc., which are often empty dicts.
+    # Allow fields like 'rich_text', 'title', etc., which are often empty dicts.
+    model_config = ConfigDict(extra="allow")
 
 
 class OpenAISchemaProperty(BaseModel):
@@ -79,12 +81,11 @@ class OpenAISchemaProperty(BaseModel):
     items: OpenAISchemaProperty | None = Field(default=None, description="Schema for items if type is 'array'.")
     # properties: dict[str, 'OpenAISchemaProperty'] | None = Field(default=None, description="Schema for sub-properties if type is 'object'.") # Forward ref
 
-    class Config:
-        extra = "allow"
+    model_config = ConfigDict(extra="allow")
 
 
 # Update for forward reference if needed for nested object properties
-# OpenAISchemaProperty.update_forward_refs()
+# OpenAISchemaProperty.model_rebuild()
 
 
 class OpenAIFunctionSchema(BaseModel):
@@ -0,0 +1,105 @@
+"""
+Persistent cache of structured extraction responses.
+
+Extraction results are stored in a small SQLite database under
+``settings.CACHE_DIRECTORY`` so that re-running the extractor on a posting it
+has already seen (same content, schema and model) skips the OpenAI call even
+across processes.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from ..core.config import get_settings
+
+_CACHE_FILE_NAME = "extraction_responses.sqlite3"
+
+
+class ExtractionResponseCache:
+    """A size- and age-bounded key/value store for extraction results.
+
+    Keys are opaque strings (callers hash their inputs); values are JSON-serializable
+    dictionaries. Entries older than ``ttl_seconds`` are ignored and the oldest
+    entries are evicted once more than ``max_entries`` are stored.
+    """
+
+    def __init__(self, path: Path, ttl_seconds: float, max_entries: int) -> None:
+        """Initialize the cache; the database file is created on first use.
+
+        Args:
+            path: Location of the SQLite database file.
+            ttl_seconds: Maximum age of an entry before it is treated as a miss.
+            max_entries: Maximum number of entries kept on disk.
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "ExtractionResponseCache | None":
+        """Build the cache from the application settings, or return None when caching is disabled."""
+        settings = get_settings()
+        if not settings.CACHE_ENABLED:
+            return None
+        return cls(
+            path=settings.CACHE_DIRECTORY / _CACHE_FILE_NAME,
+            ttl_seconds=settings.CACHE_TTL_HOURS * 3600,
+            max_entries=settings.CACHE_MAX_ENTRIES,
+        )
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the cached value for ``key``, or None if it is missing or expired."""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT value FROM responses WHERE key = ? AND created_at >= ?",
+                    (key, time.time() - self.ttl_seconds),
+                )
+                .fetchone()
+            )
+        if row is None:
+            return None
+        value: dict[str, Any] = orjson.loads(row[0])
+        return value
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entries beyond ``max_entries``."""
+        payload = orjson.dumps(value)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, payload, time.time()),
+                )
+                connection.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def close(self) -> None:
+        """Close the underlying database connection, if open."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database (creating the file and table if needed) on first use."""
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._connection = connection
+        return self._connection
@@ -1,70 +1,167 @@
-import random
+import hashlib
+import re
+from collections.abc import Callable
 from typing import Any
 
-from src.common.schemas.openai_schema import OpenAISchema
+import fastjsonschema  # type: ignore[import-untyped]
+import orjson
 
+from src.common.schemas.openai_schema import OpenAISchema
 
-def notion_property_to_openai_schema(notion_property: dict[str, Any], add_options: bool) -> dict[str, Any]:
+# Converted schemas keyed by (content hash of the Notion properties, add_options).
+# Notion schemas rarely change, so repeated extractions against the same
+# database can skip the conversion entirely.
+_OPENAI_SCHEMA_CACHE: dict[tuple[str, bool], OpenAISchema] = {}
+_OPENAI_SCHEMA_CACHE_MAX_ENTRIES = 32
+
+# Notion property types the LLM cannot fill (computed or maintained by Notion)
+_READ_ONLY_PROPERTY_TYPES = frozenset(
+    {"created_time", "created_by", "last_edited_time", "last_edited_by", "formula", "rollup"}
+)
+# Notion property types whose values are chosen from a list of options
+_OPTION_PROPERTY_TYPES = frozenset({"select", "multi_select", "status"})
+
+# Description directives consumed by the schema builder (matched case-insensitively)
+_DIRECTIVE_RE = re.compile(r"\s*#keep-options\b", re.IGNORECASE)
+# Every schema-generation directive, found in one pass over the lowercased description
+_DIRECTIVE_SCAN_RE = re.compile(r"#(exclude|keep-options)")
+
+# Per-database value converters (property name -> converter) keyed by the (name, type)
+# pairs of the Notion schema, so each LLM output is converted without type lookups.
+_NOTION_CONVERTERS_CACHE: dict[tuple[tuple[str, Any], ...], dict[str, Callable[[Any], dict[str, Any]]]] = {}
+
+# Compiled response validators keyed by the content hash of the JSON schema.
+_SCHEMA_VALIDATOR_CACHE: dict[str, Callable[[Any], Any]] = {}
+
+# (schema, its dict form, content hash of that dict) keyed by id() of memoized OpenAISchema
+# instances. The instance is held in the value, so its id cannot be reused by another object.
+_OPENAI_SCHEMA_DUMPS: dict[int, tuple[OpenAISchema, dict[str, Any], str]] = {}
+
+
+def _get_options(notion_property: dict[str, Any], prop_type: str) -> list[dict[str, Any]]:
+    """Return the option definitions of a select / multi_select / status property."""
+    options: list[dict[str, Any]] = notion_property.get(prop_type, {}).get("options", [])
+    return options
+
+
+def _enum_string_schema(notion_property: dict[str, Any], add_options: bool) -> dict[str, Any]:
+    """Schema for single-choice properties (select / status)."""
+    options = _get_options(notion_property, notion_property["type"])
+    if options and add_options:
+        return {"type": "string", "enum": [option["name"] for option in options]}
+    return {"type": "string"}
+
+
+def _enum_array_schema(notion_property: dict[str, Any], add_options: bool) -> dict[str, Any]:
+    """Schema for multi-choice properties (multi_select): an array of single-choice items."""
+    return {"type": "array", "items": _enum_string_schema(notion_property, add_options)}
+
+
+# Notion property type -> OpenAI JSON Schema fragment for types that do not depend
+# on the property config. Flat dicts only, so a shallow copy is an independent schema.
+_STATIC_OPENAI_SCHEMAS: dict[str, dict[str, Any]] = {
+    "rich_text": {"type": "string", "maxLength": 2000},
+    "title": {"type": "string", "maxLength": 2000},
+    "number": {"type": "number"},
+    "checkbox": {"type": "boolean"},
+    "date": {"type": "string", "format": "date"},
+    "email": {"type": "string", "format": "email"},
+    "phone_number": {"type": "string"},
+    "url": {"type": "string", "pattern": r"^(https?)://[^\s/\$.?#].[^\s]*$"},
+}
+
+# Notion property type -> builder of the matching OpenAI JSON Schema fragment, for
+# types that read their options or produce nested schemas.
+_OPENAI_SCHEMA_BUILDERS: dict[str, Callable[[dict[str, Any], bool], dict[str, Any]]] = {
+    "select": _enum_string_schema,
+    "status": _enum_string_schema,
+    "multi_select": _enum_array_schema,
+    "people": lambda _prop, _opts: {"type": "array", "items": {"type": "string"}},
+    "files": lambda _prop, _opts: {"type": "array", "items": {"type": "string", "format": "uri"}},
+}
+
+
+def _default_schema(_notion_property: dict[str, Any], _add_options: bool) -> dict[str, Any]:
+    """Default to string for unsupported types."""
+    return {"type": "string"}
+
+
+def notion_property_to_openai_schema(
+    notion_property: dict[str, Any], add_options: bool, description_override: str | None = None
+) -> dict[str, Any]:
     """Convert a Notion property definition to OpenAI JSON Schema format.
 
     Args:
         notion_property: Notion property definition with 'type' and other config
+        add_options: Whether to include enum options for select properties
+        description_override: Description to use instead of the property's own one
 
     Returns:
         OpenAI-compatible JSON Schema definition
     """
-    property_type = notion_property.get("type")
-    description = notion_property.get("description", "")
-    property: dict[str, Any] = {}
-
-    match property_type:
-        case "rich_text" | "title":
-            property = {"type": "string", "maxLength": 2000}
-        case "number":
-            property = {"type": "number"}
-        case "checkbox":
-            property = {"type": "boolean"}
-        case "select":
-            options = notion_property.get("select", {}).get("options", [])
-            if options and add_options:
-                property = {"type": "string", "enum": [option["name"] for option in options]}
-            else:
-                property = {"type": "string"}
-        case "status":
-            options = notion_property.get("status", {}).get("options", [])
-            if options and add_options:
-                property = {"type": "string", "enum": [option["name"] for option in options]}
-            else:
-                property = {"type": "string"}
-        case "multi_select":
-            options = notion_property.get("multi_select", {}).get("options", [])
-            if options and add_options:
-                property = {
-                    "type": "array",
-                    "items": {"type": "string", "enum": [option["name"] for option in options]},
-                }
-            else:
-                property = {"type": "array", "items": {"type": "string"}}
-        case "date":
-            property = {"type": "string", "format": "date"}
-        case "email":
-            property = {"type": "string", "format": "email"}
-        case "phone_number":
-            property = {"type": "string"}
-        case "url":
-            property = {"type": "string", "pattern": r"^(https?)://[^\s/$.?#].[^\s]*$"}
-        case "people":
-            property = {"type": "array", "items": {"type": "string"}}
-        case "files":
-            property = {"type": "array", "items": {"type": "string", "format": "uri"}}
-        case _:
-            # Default to string for unsupported types
-            property = {"type": "string"}
+    prop_type = notion_property.get("type", "")
+    static = _STATIC_OPENAI_SCHEMAS.get(prop_type)
+    if static is not None:
+        property = dict(static)
+    else:
+        property = _OPENAI_SCHEMA_BUILDERS.get(prop_type, _default_schema)(notion_property, add_options)
+    description = notion_property.get("description", "") if description_override is None else description_override
     if description:
         property["description"] = description
     return property
 
 
+def _multi_select_value(value: Any) -> dict[str, Any]:
+    """Notion value of a multi_select property, dropping empty entries."""
+    if not isinstance(value, list):
+        return {}
+    filtered = [v for v in value if v not in (None, "")]
+    if not filtered:
+        return {}
+    return {"multi_select": [{"name": str(v)} for v in filtered]}
+
+
+def _files_value(value: Any) -> dict[str, Any]:
+    """Notion value of a files property: one external file per non-empty URL."""
+    if not isinstance(value, list) or not value:
+        return {}
+    return {
+        "files": [
+            {
+                "type": "external",
+                "name": str(url).split("/")[-1],
+                "external": {"url": str(url)},
+            }
+            for url in value
+            if url
+        ]
+    }
+
+
+# Notion property type -> converter of an LLM value (never None) to the Notion property value.
+_NOTION_VALUE_CONVERTERS: dict[str, Callable[[Any], dict[str, Any]]] = {
+    "title": lambda value: {"title": [{"type": "text", "text": {"content": str(value)}}]},
+    "rich_text": lambda value: {"rich_text": [{"type": "text", "text": {"content": str(value)}}]},
+    "number": lambda value: {"number": float(value)},
+    "checkbox": lambda value: {"checkbox": bool(value)},
+    "select": lambda value: {"select": {"name": str(value)}} if value else {},
+    "status": lambda value: {"status": {"name": str(value)}} if value else {},
+    "multi_select": _multi_select_value,
+    "date": lambda value: {"date": {"start": str(value)}} if value else {},
+    "email": lambda value: {"email": str(value)} if value else {},
+    "phone_number": lambda value: {"phone_number": str(value)} if value else {},
+    "url": lambda value: {"url": str(value)} if value else {},
+    # Always return empty dict for people (complex type, not handled)
+    "people": lambda _value: {},
+    "files": _files_value,
+}
+
+
+def _default_notion_value(value: Any) -> dict[str, Any]:
+    """Default to rich_text for unknown types."""
+    return {"rich_text": [{"text": {"content": str(value)}}]}
+
+
 def openai_data_to_notion_property(value: Any, property_type: str) -> dict[str, Any]:
     """Convert OpenAI response data to Notion property value format.
 
@@ -77,57 +174,7 @@ def openai_data_to_notion_property(value: Any, property_type: str) -> dict[str,
     """
     if value is None:
         return {}
-
-    match property_type:
-        case "title":
-            return {"title": [{"type": "text", "text": {"content": str(value)}}]}
-        case "rich_text":
-            return {"rich_text": [{"type": "text", "text": {"content": str(value)}}]}
-        case "number":
-            return {"number": float(value) if value is not None else None}
-        case "checkbox":
-            return {"checkbox": bool(value)}
-        case "select":
-            return {"select": {"name": str(value)}} if value else {}
-        case "status":
-            return {"status": {"name": str(value)}} if value else {}
-        case "multi_select":
-            if isinstance(value, list):
-                filtered = [v for v in value if v not in (None, "")]
-                if not filtered:
-                    return {}
-                return {"multi_select": [{"name": str(v)} for v in filtered]}
-            else:
-                return {}
-        case "date":
-            return {"date": {"start": str(value)}} if value else {}
-        case "email":
-            return {"email": str(value)} if value else {}
-        case "phone_number":
-            return {"phone_number": str(value)} if value else {}
-        case "url":
-            return {"url": str(value)} if value else {}
-        case "people":
-            # Always return empty dict for people (complex type, not handled)
-            return {}
-        case "files":
-            if isinstance(value, list) and value:
-                return {
-                    "files": [
-                        {
-                            "type": "external",
-                            "name": str(url).split("/")[-1],
-                            "external": {"url": str(url)},
-                        }
-                        for url in value
-                        if url
-                    ]
-                }
-            else:
-                return {}
-        case _:
-            # Default to rich_text for unknown types
-            return {"rich_text": [{"text": {"content": str(value)}}]}
+    return _NOTION_VALUE_CONVERTERS.get(property_type, _default_notion_value)(value)
 
 
 def _should_exclude_property(prop_type: str, prop_desc: str) -> bool:
@@ -140,8 +187,7 @@ def _should_exclude_property(prop_type: str, prop_desc: str) -> bool:
     Returns:
         True if the property should be excluded
     """
-    readonly_types = {"created_time", "created_by", "last_edited_time", "last_edited_by", "formula", "rollup"}
-    return prop_type in readonly_types or "#exclude" in prop_desc
+    return prop_type in _READ_ONLY_PROPERTY_TYPES or "exclude" in _parse_directives(prop_desc)
 
 
 def _should_keep_options(prop_desc: str) -> bool:
@@ -153,7 +199,17 @@ def _should_keep_options(prop_desc: str) -> bool:
     Returns:
         True if options should be preserved
     """
-    return "#keep-options" in prop_desc
+    return "keep-options" in _parse_directives(prop_desc)
+
+
+def _parse_directives(prop_desc: str) -> frozenset[str]:
+    """Return the directives (``exclude``, ``keep-options``) present in a lowercased description."""
+    return frozenset(_DIRECTIVE_SCAN_RE.findall(prop_desc)) if "#" in prop_desc else frozenset()
+
+
+def _strip_directives(description: str) -> str:
+    """Remove schema-generation directives (e.g. ``#keep-options``) from a property description."""
+    return _DIRECTIVE_RE.sub("", description).strip()
 
 
 def _generate_example_description(prop_config: dict[str, Any], prop_type: str) -> str:
@@ -166,16 +222,75 @@ def _generate_example_description(prop_config: dict[str, Any], prop_type: str) -
     Returns:
         Example description string
     """
-    options = prop_config.get(prop_type, {}).get("options", [])
+    options = _get_options(prop_config, prop_type)
     if not options:
         return ""
 
-    # Sample up to 3 random options for examples
-    sample_size = min(3, len(options))
-    sampled_examples = random.sample(options, sample_size)
-    example_names = [option["name"] for option in sampled_examples]
+    # Pick 3 options spread evenly over the list, in their Notion order. The choice must be
+    # deterministic: the generated schema is hashed into the extraction cache key.
+    if len(options) <= 3:
+        sampled_examples = options
+    else:
+        sampled_examples = [options[i * len(options) // 3] for i in range(3)]
+
+    return "e.g. " + ", ".join(option["name"] for option in sampled_examples) + ", ..."
+
+
+def _content_hash(value: Any) -> str:
+    """Return a stable SHA-256 of a JSON-like value, independent of key order."""
+    return hashlib.sha256(orjson.dumps(value, default=str, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _notion_properties_cache_key(notion_properties: dict[str, Any], add_options: bool) -> tuple[str, bool]:
+    """Build a stable cache key from the content of the Notion properties."""
+    return _content_hash(notion_properties), add_options
+
+
+def dump_openai_schema(openai_schema: OpenAISchema) -> tuple[dict[str, Any], str]:
+    """Return an OpenAISchema as a dict together with the content hash of that dict.
 
-    return "e.g. " + ", ".join(example_names) + ", ..."
+    Both are computed once per schema *instance*: memoized schemas are shared, so
+    repeated extractions with the same instance skip the model dump and the canonical
+    serialization entirely. The returned dict is shared as well and must be treated
+    as read-only.
+
+    Args:
+        openai_schema: A schema returned by ``create_openai_schema_from_notion_database``.
+
+    Returns:
+        The schema dict and a stable key usable with ``get_openai_schema_validator``.
+    """
+    entry = _OPENAI_SCHEMA_DUMPS.get(id(openai_schema))
+    if entry is None:
+        schema = openai_schema.dict()
+        entry = (openai_schema, schema, _content_hash(schema))
+        if len(_OPENAI_SCHEMA_DUMPS) >= _OPENAI_SCHEMA_CACHE_MAX_ENTRIES:
+            # Evict the oldest entry (dicts preserve insertion order)
+            del _OPENAI_SCHEMA_DUMPS[next(iter(_OPENAI_SCHEMA_DUMPS))]
+        _OPENAI_SCHEMA_DUMPS[id(openai_schema)] = entry
+    return entry[1], entry[2]
+
+
+def get_openai_schema_validator(schema: dict[str, Any], schema_key: str | None = None) -> Callable[[Any], Any]:
+    """Return a compiled ``fastjsonschema`` validator for an OpenAI JSON schema.
+
+    Validators are compiled once per distinct schema and reused. ``format`` keywords
+    are not enforced locally, only structure, types, enums and required keys.
+
+    Args:
+        schema: The JSON schema sent to OpenAI for structured output.
+        schema_key: Content hash of ``schema`` when already known (see ``dump_openai_schema``).
+
+    Returns:
+        A callable raising ``fastjsonschema.JsonSchemaValueException`` on invalid data.
+    """
+    if schema_key is None:
+        schema_key = _content_hash(schema)
+    validator = _SCHEMA_VALIDATOR_CACHE.get(schema_key)
+    if validator is None:
+        validator = fastjsonschema.compile(schema, use_formats=False)
+        _SCHEMA_VALIDATOR_CACHE[schema_key] = validator
+    return validator
 
 
 def create_openai_schema_from_notion_database(notion_properties: dict[str, Any], add_options: bool) -> OpenAISchema:
@@ -184,6 +299,10 @@ def create_openai_schema_from_notion_database(notion_properties: dict[str, Any],
     This function converts Notion database properties into an OpenAI-compatible JSON schema
     for structured output. It handles special description directives and option sampling.
 
+    Results are memoized by the content of ``notion_properties`` and ``add_options``, so the
+    returned instance is shared between callers and must be treated as read-only. The input
+    dictionary is not modified.
+
     Args:
         notion_properties: Dictionary of Notion property definitions
         add_options: Whether to include enum options for select properties
@@ -207,38 +326,84 @@ def create_openai_schema_from_notion_database(notion_properties: dict[str, Any],
         >>> schema["properties"]["status"]["enum"]
         ["Todo", "Done"]
     """
+    cache_key = _notion_properties_cache_key(notion_properties, add_options)
+    cached_schema = _OPENAI_SCHEMA_CACHE.get(cache_key)
+    if cached_schema is not None:
+        return cached_schema
+
+    openai_schema = _build_openai_schema(notion_properties, add_options)
+
+    if len(_OPENAI_SCHEMA_CACHE) >= _OPENAI_SCHEMA_CACHE_MAX_ENTRIES:
+        # Evict the oldest entry (dicts preserve insertion order)
+        del _OPENAI_SCHEMA_CACHE[next(iter(_OPENAI_SCHEMA_CACHE))]
+    _OPENAI_SCHEMA_CACHE[cache_key] = openai_schema
+    return openai_schema
+
+
+def _build_openai_schema(notion_properties: dict[str, Any], add_options: bool) -> OpenAISchema:
+    """Convert Notion database properties to an OpenAISchema (uncached)."""
     schema: dict[str, Any] = {"type": "object", "properties": {}, "required": [], "additionalProperties": False}
 
     for prop_name, prop_config in notion_properties.items():
         prop_type = prop_config.get("type")
-        prop_desc = prop_config.get("description", "").strip().lower()
+        description = prop_config.get("description", "")
+        original_desc = description.strip()
+        prop_desc = original_desc.lower() if original_desc else ""
+        directives = _parse_directives(prop_desc)
 
         # Skip excluded properties
-        if _should_exclude_property(prop_type, prop_desc):
+        if prop_type in _READ_ONLY_PROPERTY_TYPES or "exclude" in directives:
             continue
 
         # Determine if we should add options for this specific property
-        force_keep_options = _should_keep_options(prop_desc)
+        force_keep_options = "keep-options" in directives
         include_options = add_options or force_keep_options
 
+        # The directives only steer schema generation: keep them out of the tokens sent to the LLM
+        if force_keep_options:
+            original_desc = _strip_directives(original_desc)
+            description = original_desc
+
         # Generate example descriptions for select-type properties when not including options
-        if not include_options and prop_type in ["select", "multi_select", "status"] and not force_keep_options:
+        if not include_options and prop_type in _OPTION_PROPERTY_TYPES:
             example_desc = _generate_example_description(prop_config, prop_type)
             if example_desc:
                 # Preserve original description if it exists
-                original_desc = prop_config.get("description", "").strip()
-                if original_desc and not original_desc.lower().startswith("#"):
-                    prop_config["description"] = f"{original_desc} | {example_desc}"
+                if original_desc and not prop_desc.startswith("#"):
+                    description = f"{original_desc} | {example_desc}"
                 else:
-                    prop_config["description"] = example_desc
+                    description = example_desc
 
         # Convert to OpenAI schema
-        schema["properties"][prop_name] = notion_property_to_openai_schema(prop_config, add_options=include_options)
+        schema["properties"][prop_name] = notion_property_to_openai_schema(
+            prop_config, add_options=include_options, description_override=description
+        )
         schema["required"].append(prop_name)
 
     return OpenAISchema(**schema)
 
 
+def _get_notion_value_converters(
+    notion_properties: dict[str, Any],
+) -> dict[str, Callable[[Any], dict[str, Any]]]:
+    """Return the value converter of every property in a database schema, resolved once per schema.
+
+    Only the property names and types matter, so they form the cache key: cheap to build
+    and unaffected by option lists or descriptions.
+    """
+    cache_key = tuple((name, config.get("type")) for name, config in notion_properties.items())
+    converters = _NOTION_CONVERTERS_CACHE.get(cache_key)
+    if converters is None:
+        converters = {
+            name: _NOTION_VALUE_CONVERTERS.get(prop_type, _default_notion_value) for name, prop_type in cache_key
+        }
+        if len(_NOTION_CONVERTERS_CACHE) >= _OPENAI_SCHEMA_CACHE_MAX_ENTRIES:
+            # Evict the oldest entry (dicts preserve insertion order)
+            del _NOTION_CONVERTERS_CACHE[next(iter(_NOTION_CONVERTERS_CACHE))]
+        _NOTION_CONVERTERS_CACHE[cache_key] = converters
+    return converters
+
+
 def build_notion_properties_from_llm_output(
     openai_response: dict[str, Any], notion_properties: dict[str, Any]
 ) -> dict[str, Any]:
@@ -261,17 +426,18 @@ def build_notion_properties_from_llm_output(
         be passed directly to ``NotionClient.pages.create`` or
         ``NotionClient.pages.update``.
     """
+    converters = _get_notion_value_converters(notion_properties)
     properties: dict[str, Any] = {}
 
     for prop_name, value in openai_response.items():
-        if prop_name not in notion_properties:
-            # Skip keys that do not exist in the destination DB – this can
-            # happen if the LLM hallucinated a column or if the schema was
-            # modified between extraction and save.
+        # Keys that do not exist in the destination DB are skipped – this can
+        # happen if the LLM hallucinated a column or if the schema was
+        # modified between extraction and save.
+        converter = converters.get(prop_name)
+        if converter is None or value is None:
             continue
 
-        prop_type = notion_properties[prop_name].get("type")
-        notion_value = openai_data_to_notion_property(value, prop_type)
+        notion_value = converter(value)
 
         # Only include if the conversion produced a *non–empty* payload.
         if notion_value:
@@ -1,4 +1,12 @@
+import asyncio
+import hashlib
+import os
+import re
 import subprocess
+import tempfile
+import uuid
+from collections.abc import Sequence
+from functools import cache, lru_cache
 from pathlib import Path
 from shutil import copy2
 
@@ -7,6 +15,59 @@ from src.core.config import Settings
 from src.core.logger import logger
 from src.resume_tailoring.pdf_compiler import PDFCompiler
 
+# "Pages:" line of pdfinfo output, matched on the raw bytes
+_PDFINFO_PAGES_RE = re.compile(rb"^Pages:\s+(\d+)", re.MULTILINE)
+
+# Subdirectory of CACHE_DIRECTORY holding compiled PDFs keyed by their .tex content
+_PDF_CACHE_SUBDIRECTORY = "pdf"
+
+# latexdiff options shared by every diff: word-level markup, with the resume template's
+# custom commands treated as text so their arguments are diffed too
+_LATEXDIFF_ARGS = (
+    "--type=WORD",
+    "-t",
+    "UNDERLINE",
+    "--append-textcmd=introduction",
+    "--append-textcmd=resumeItem",
+    "--append-textcmd=resumeItemListStart",
+    "--append-textcmd=resumeItemListEnd",
+    "--append-textcmd=resumeSubheading",
+    "--append-textcmd=resumeSubHeadingListStart",
+    "--append-textcmd=resumeSubHeadingListEnd",
+    "--append-textcmd=techSkillsItem",
+)
+
+
+@cache
+def _shared_memory_directory() -> Path | None:
+    """Return /dev/shm when it is a writable tmpfs directory (Linux), otherwise None."""
+    shm = Path("/dev/shm")
+    return shm if shm.is_dir() and os.access(shm, os.W_OK | os.X_OK) else None
+
+
+@lru_cache(maxsize=256)
+def _pdf_page_count(path_str: str, mtime_ns: int, size: int) -> int:
+    """Read the page count of a PDF with pdfinfo, cached by path, modification time and size."""
+    result = subprocess.run(["pdfinfo", path_str], capture_output=True, check=True)
+    match = _PDFINFO_PAGES_RE.search(result.stdout)
+    if match is None:
+        raise ValueError("Could not find page count in pdfinfo output.")
+    return int(match.group(1))
+
+
+@lru_cache(maxsize=32)
+def _pdf_text_pages(path_str: str, mtime_ns: int, size: int) -> tuple[str, ...]:
+    """Run pdftotext once over the whole PDF and split its output into pages.
+
+    ``mtime_ns`` and ``size`` are only part of the cache key, so a rewritten PDF is read again.
+    """
+    # pdftotext terminates every page with a form feed; "-" writes to stdout
+    result = subprocess.run(["pdftotext", path_str, "-"], capture_output=True, text=True, check=True, encoding="utf-8")
+    pages = result.stdout.split("\x0c")
+    if pages and not pages[-1]:
+        pages.pop()
+    return tuple(pages)
+
 
 class LatexService:
     def __init__(self, pdf_compiler: PDFCompiler, settings: Settings) -> None:
@@ -26,20 +87,100 @@ class LatexService:
 
     def compile_resume(self, tex_file_path: Path) -> Path:
         """
-        Compile a .tex file to PDF using a temporary latex_build/ directory for all pdflatex outputs.
-        Only the PDF is copied to the tex_file_path's parent directory; auxiliary files remain in latex_build/.
+        Compile a .tex file to PDF using a temporary build directory for all pdflatex outputs.
+        Only the PDF is moved to the tex_file_path's parent directory; auxiliary files are discarded
+        with the build directory.
+
+        When caching is enabled, PDFs are also kept under CACHE_DIRECTORY/pdf keyed by the SHA-256
+        of the .tex content, and recompiling identical content only copies the cached PDF.
         """
+        output_pdf = tex_file_path.with_suffix(".pdf")
+        cached_pdf = self._cached_pdf_path(tex_file_path)
+        if cached_pdf is not None and cached_pdf.exists():
+            copy2(cached_pdf, output_pdf)
+            os.utime(cached_pdf)  # Mark as recently used for eviction
+            logger.info(f"Reusing cached PDF for {tex_file_path}")
+            return output_pdf
+
+        # Aux files only live for the duration of the compile: keep them out of the output tree,
+        # under LATEX_BUILD_DIRECTORY when set, else in RAM-backed /dev/shm or the system temp directory
+        build_parent = self.settings.LATEX_BUILD_DIRECTORY
+        if build_parent is not None:
+            build_parent.mkdir(parents=True, exist_ok=True)
+        else:
+            build_parent = _shared_memory_directory()
+        with tempfile.TemporaryDirectory(prefix="latex_build_", dir=build_parent) as build_dir:
+            pdf_path = self.pdf_compiler.compile_tex_to_pdf(tex_file_path, Path(build_dir))
 
-        # Use latex_build/ in the codebase for aux files
-        build_dir = tex_file_path.parent / "latex_build"
-        build_dir.mkdir(exist_ok=True)
-        pdf_path = self.pdf_compiler.compile_tex_to_pdf(tex_file_path, build_dir)
+            # Move only the PDF to the output dir (where the .tex file is): a rename on the same
+            # filesystem, with a copy as fallback when the build directory lives on another device
+            output_pdf = tex_file_path.parent / pdf_path.name
+            try:
+                os.replace(pdf_path, output_pdf)
+            except OSError:
+                copy2(pdf_path, output_pdf)
 
-        # Move only the PDF to the output dir (where the .tex file is)
-        output_pdf = tex_file_path.parent / pdf_path.name
-        copy2(pdf_path, output_pdf)
+        if cached_pdf is not None:
+            self._store_cached_pdf(output_pdf, cached_pdf)
         return output_pdf
 
+    def _cached_pdf_path(self, tex_file_path: Path) -> Path | None:
+        """Return where the PDF of this .tex content is cached, or None when caching is disabled."""
+        if not self.settings.CACHE_ENABLED:
+            return None
+        key = hashlib.sha256(tex_file_path.read_bytes()).hexdigest()[:32]
+        return self.settings.CACHE_DIRECTORY / _PDF_CACHE_SUBDIRECTORY / f"{key}.pdf"
+
+    def _store_cached_pdf(self, pdf_path: Path, cached_pdf: Path) -> None:
+        """Copy a compiled PDF into the cache atomically, evicting the least recently used entries."""
+        cache_dir = cached_pdf.parent
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Copy under a unique name first so concurrent compiles never expose a partial PDF
+        partial_pdf = cache_dir / f"{cached_pdf.stem}.{uuid.uuid4().hex}.tmp"
+        copy2(pdf_path, partial_pdf)
+        os.replace(partial_pdf, cached_pdf)
+        os.utime(cached_pdf)
+
+        try:
+            entries = sorted(cache_dir.glob("*.pdf"), key=lambda path: path.stat().st_mtime)
+        except FileNotFoundError:  # Another compile evicted an entry while listing: leave it to that one
+            return
+        for stale_pdf in entries[: max(0, len(entries) - self.settings.CACHE_MAX_ENTRIES)]:
+            stale_pdf.unlink(missing_ok=True)
+
+    def prepare_format(self, tex_file_path: Path) -> None:
+        """
+        Dump the preamble of a .tex file into a pdflatex format ahead of compiling documents that share it.
+        Failures are only logged: compile_resume then builds the format itself or compiles without one.
+        """
+        try:
+            self.pdf_compiler.ensure_format(tex_file_path)
+        except OSError as e:
+            logger.warning(f"Could not prepare a pdflatex format for {tex_file_path}: {e}")
+
+    async def compile_resume_async(self, tex_file_path: Path) -> Path:
+        """
+        Async counterpart of compile_resume: pdflatex runs from a worker thread so the event loop stays free.
+        """
+        return await asyncio.to_thread(self.compile_resume, tex_file_path)
+
+    async def compile_resumes_async(
+        self, tex_file_paths: Sequence[Path], max_concurrency: int | None = None
+    ) -> list[Path]:
+        """
+        Compile several .tex files concurrently and return their PDFs in input order.
+
+        pdflatex is single-threaded, so independent documents are compiled in parallel with at most
+        max_concurrency (default: the number of CPUs) processes running at once.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or os.cpu_count() or 1)
+
+        async def compile_one(tex_file_path: Path) -> Path:
+            async with semaphore:
+                return await self.compile_resume_async(tex_file_path)
+
+        return list(await asyncio.gather(*(compile_one(tex_file_path) for tex_file_path in tex_file_paths)))
+
     def run_latexdiff(
         self,
         original_tex_path: Path,
@@ -49,29 +190,30 @@ class LatexService:
     ) -> Path | None:
         target_directory.mkdir(parents=True, exist_ok=True)
         diff_tex_path = target_directory / f"{diff_output_stem}.tex"
-        cmd = [
-            self.settings.LATEXDIFF_COMMAND,
-            "--type=WORD",
-            "-t",
-            "UNDERLINE",
-            "--append-textcmd=introduction",
-            "--append-textcmd=resumeItem",
-            "--append-textcmd=resumeItemListStart",
-            "--append-textcmd=resumeItemListEnd",
-            "--append-textcmd=resumeSubheading",
-            "--append-textcmd=resumeSubHeadingListStart",
-            "--append-textcmd=resumeSubHeadingListEnd",
-            "--append-textcmd=techSkillsItem",
-            str(original_tex_path),
-            str(tailored_tex_path),
-        ]
+        cmd = [self.settings.LATEXDIFF_COMMAND, *_LATEXDIFF_ARGS, str(original_tex_path), str(tailored_tex_path)]
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            write_file_content(diff_tex_path, result.stdout)
+            # latexdiff writes the diff straight into the file instead of through a Python string
+            with diff_tex_path.open("wb") as diff_file:
+                subprocess.run(cmd, stdout=diff_file, stderr=subprocess.PIPE, check=True)
             return diff_tex_path
         except Exception:
+            diff_tex_path.unlink(missing_ok=True)
             return None
 
+    async def run_latexdiff_async(
+        self,
+        original_tex_path: Path,
+        tailored_tex_path: Path,
+        diff_output_stem: str,
+        target_directory: Path,
+    ) -> Path | None:
+        """
+        Async counterpart of run_latexdiff: latexdiff runs from a worker thread so the event loop stays free.
+        """
+        return await asyncio.to_thread(
+            self.run_latexdiff, original_tex_path, tailored_tex_path, diff_output_stem, target_directory
+        )
+
     def get_pdf_page_count(self, pdf_path: Path) -> int:
         """Get the number of pages in a PDF file using pdfinfo."""
         if not pdf_path.exists():
@@ -79,12 +221,8 @@ class LatexService:
 
         try:
             # Ensure pdfinfo is available, consider adding a check or specific error handling
-            cmd = ["pdfinfo", str(pdf_path)]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True, encoding="utf-8")
-            for line in result.stdout.splitlines():
-                if line.lower().startswith("pages:"):
-                    return int(line.split(":")[1].strip())
-            raise ValueError("Could not find page count in pdfinfo output.")
+            stat = pdf_path.stat()
+            return _pdf_page_count(str(pdf_path), stat.st_mtime_ns, stat.st_size)
         except FileNotFoundError:
             # This specific exception is for when 'pdfinfo' itself is not found
             # logger.error("pdfinfo command not found. Please ensure it's installed and in your PATH.")
@@ -94,37 +232,47 @@ class LatexService:
             # logger.error(f"Error getting PDF page count for {pdf_path}: {e}")
             raise RuntimeError(f"Error getting PDF page count for {pdf_path}: {e}")
 
+    def get_text_per_page(self, pdf_path: Path) -> list[str]:
+        """Extract the text of every page of a PDF file with a single pdftotext run."""
+        try:
+            return list(self._read_pdf_pages(pdf_path))
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Error extracting text from PDF {pdf_path} using pdftotext: {e}. Stderr: {e.stderr}")
+            raise RuntimeError(f"Error extracting text from PDF {pdf_path}: {e}")
+
     def get_text_from_pdf_page(self, pdf_path: Path, page_number: int) -> str | None:
         """Extract text from a specific page of a PDF file using pdftotext."""
+        try:
+            pages = self._read_pdf_pages(pdf_path)
+        except subprocess.CalledProcessError as e:
+            # This handles errors from pdftotext execution (e.g., corrupted PDF)
+            logger.error(
+                f"Error extracting text from PDF page {page_number} of {pdf_path} using pdftotext: {e}. Stderr: {e.stderr}"
+            )
+            # Return None to indicate failure to extract text from that specific page, allowing the process to continue if desired.
+            return None
+
+        if not 1 <= page_number <= len(pages):
+            logger.error(f"Page {page_number} is out of range for {pdf_path} ({len(pages)} pages)")
+            return None
+        return pages[page_number - 1]
+
+    def _read_pdf_pages(self, pdf_path: Path) -> tuple[str, ...]:
+        """Return the text of every page, reusing the previous pdftotext run while the file is unchanged."""
         if not pdf_path.exists():
             logger.error(f"PDF file not found for text extraction: {pdf_path}")
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
 
         try:
-            # pdftotext outputs to stdout by default if '-' is used for the output file
-            cmd = [
-                "pdftotext",
-                "-f",
-                str(page_number),  # First page to convert
-                "-l",
-                str(page_number),  # Last page to convert
-                str(pdf_path),
-                "-",  # Output to stdout
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True, encoding="utf-8")
-            return result.stdout
+            stat = pdf_path.stat()
+            return _pdf_text_pages(str(pdf_path), stat.st_mtime_ns, stat.st_size)
         except FileNotFoundError:
             # This specific exception is for when 'pdftotext' itself is not found
             logger.error("pdftotext command not found. Please ensure it's installed and in your PATH.")
             raise RuntimeError("pdftotext command not found. Please ensure it's installed and in your PATH.")
-        except subprocess.CalledProcessError as e:
-            # This handles errors from pdftotext execution (e.g., invalid page, corrupted PDF)
-            logger.error(
-                f"Error extracting text from PDF page {page_number} of {pdf_path} using pdftotext: {e}. Stderr: {e.stderr}"
-            )
-            # Return None to indicate failure to extract text from that specific page, allowing the process to continue if desired.
-            return None
+        except subprocess.CalledProcessError:
+            raise
         except Exception as e:
             # Catch any other unexpected errors
-            logger.error(f"Unexpected error extracting text from PDF {pdf_path} on page {page_number}: {e}")
-            raise RuntimeError(f"Unexpected error extracting text from PDF {pdf_path} on page {page_number}: {e}")
+            logger.error(f"Unexpected error extracting text from PDF {pdf_path}: {e}")
+            raise RuntimeError(f"Unexpected error extracting text from PDF {pdf_path}: {e}")
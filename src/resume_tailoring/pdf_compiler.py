@@ -1,9 +1,26 @@
+import hashlib
+import re
+import shlex
 import subprocess
+import threading
 from collections.abc import Sequence
 from pathlib import Path
 
 from src.core.logger import logger
 
+# Commands whose output depends on the .aux file written by a previous pass
+_CROSS_REFERENCE_RE = re.compile(
+    r"\\(?:ref|pageref|eqref|autoref|cref|Cref|label|cite\w*|tableofcontents|listoffigures|listoftables)\b"
+)
+# End of the preamble that gets dumped into a precompiled format
+_BEGIN_DOCUMENT = b"\\begin{document}"
+# Lines of the pdflatex .log quoted in compilation errors
+_LOG_TAIL_LINES = 60
+# .log messages showing that a dumped preamble format, not the document body, broke the run
+_FORMAT_ERROR_RE = re.compile(
+    rb"can't find the format file|Fatal format file error|\.fmt (?:was written by|made by different)"
+)
+
 
 class PDFCompilationError(Exception):
     """Raised when PDF compilation from LaTeX fails."""
@@ -17,12 +34,15 @@ class PDFCompiler:
         pdflatex_cmd: str = "pdflatex",
         pdflatex_args: Sequence[str] | None = None,
         command_template: str | None = None,
+        format_directory: Path | None = None,
     ) -> None:
         """
         Args:
             pdflatex_cmd: The pdflatex executable (default: "pdflatex").
             pdflatex_args: List of default arguments for pdflatex.
-            command_template: Optional shell command template (overrides cmd/args if set).
+            command_template: Optional command template (overrides cmd/args if set). It is split into
+                arguments with shell quoting rules once, and run without a shell.
+            format_directory: Optional directory for precompiled preamble formats (disabled if None).
         """
         self.pdflatex_cmd = pdflatex_cmd
         self.pdflatex_args = pdflatex_args or [
@@ -32,6 +52,62 @@ class PDFCompiler:
             "%DOC%",
         ]
         self.command_template = command_template
+        self._command_template_args = shlex.split(command_template) if command_template else []
+        self.format_directory = format_directory
+        self._formats: dict[str, Path | None] = {}
+        self._format_lock = threading.Lock()
+
+    def ensure_format(self, tex_file_path: Path) -> Path | None:
+        """
+        Dump the preamble of a .tex file into a pdflatex format and return the .fmt path.
+
+        The format is built with mylatexformat once per distinct preamble (everything before
+        \\begin{document}) and reused by later compiles through -fmt, so pdflatex no longer
+        re-reads the document class and packages on every pass.
+        Returns None when formats are disabled, the file has no preamble, or the dump fails.
+        """
+        if self.format_directory is None or self.command_template:
+            return None
+        preamble, marker, _ = tex_file_path.read_bytes().partition(_BEGIN_DOCUMENT)
+        if not marker:
+            return None
+        fmt_name = "preamble-" + hashlib.sha256(self.pdflatex_cmd.encode() + b"\0" + preamble).hexdigest()[:16]
+
+        with self._format_lock:
+            if fmt_name in self._formats:
+                return self._formats[fmt_name]
+
+            format_directory = self.format_directory.resolve()
+            fmt_path = format_directory / f"{fmt_name}.fmt"
+            if not fmt_path.exists():
+                format_directory.mkdir(parents=True, exist_ok=True)
+                cmd = [
+                    self.pdflatex_cmd,
+                    "-ini",
+                    "-interaction=nonstopmode",
+                    "-halt-on-error",
+                    f"-jobname={fmt_name}",
+                    f"-output-directory={format_directory}",
+                    "&pdflatex",
+                    "mylatexformat.ltx",
+                    str(tex_file_path.resolve()),
+                ]
+                logger.info(f"Dumping pdflatex format for the preamble of {tex_file_path}: {' '.join(cmd)}")
+                try:
+                    result = subprocess.run(
+                        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=tex_file_path.parent
+                    )
+                    dumped = result.returncode == 0 and fmt_path.exists()
+                except OSError as e:
+                    logger.warning(f"Could not run {self.pdflatex_cmd} to dump a format: {e}")
+                    dumped = False
+                if not dumped:
+                    logger.warning(f"Could not dump a pdflatex format for {tex_file_path}, compiling without one")
+                    self._formats[fmt_name] = None
+                    return None
+
+            self._formats[fmt_name] = fmt_path
+            return fmt_path
 
     def compile_tex_to_pdf(self, tex_file_path: Path, output_directory: Path) -> Path:
         """
@@ -48,54 +124,63 @@ class PDFCompiler:
         pdf_path = output_directory / (tex_file_path.stem + ".pdf")
 
         # Prepare command
+        fmt_path: Path | None = None
         if self.command_template:
-            cmd_str: str = self.command_template.replace("%OUTDIR%", str(output_directory)).replace(
-                "%DOC%", str(tex_file_path)
-            )
-            cmd_to_run: str | list[str] = cmd_str
-            shell = True
+            cmd_to_run = [
+                arg.replace("%OUTDIR%", str(output_directory)).replace("%DOC%", str(tex_file_path))
+                for arg in self._command_template_args
+            ]
         else:
             args = [
                 arg.replace("%OUTDIR%", str(output_directory)).replace("%DOC%", str(tex_file_path))
                 for arg in self.pdflatex_args
             ]
-            cmd_to_run = [self.pdflatex_cmd] + args
-            shell = False
+            fmt_path = self.ensure_format(tex_file_path)
+            # kpathsea appends the .fmt extension itself
+            fmt_args = [f"-fmt={fmt_path.with_suffix('')}"] if fmt_path is not None else []
+            cmd_to_run = [self.pdflatex_cmd] + fmt_args + args
+        cmd_display = shlex.join(cmd_to_run)
 
-        last_stdout = ""
-        last_stderr = ""
+        last_stderr = b""
+        # pdflatex writes its full transcript to the .log: only read it when it is needed
+        log_path = output_directory / (tex_file_path.stem + ".log")
+        if fmt_path is not None:
+            # pdflatex opens the .log only once the format is loaded: a stale one would hide that
+            log_path.unlink(missing_ok=True)
 
         for i in range(2):  # Run up to 2 times for cross-referencing
-            current_cmd_to_run = cmd_to_run
-            if shell and isinstance(current_cmd_to_run, list):  # Ensure command is a string if shell=True
-                current_cmd_to_run = " ".join(current_cmd_to_run)
-
-            logger.info(
-                f"Running pdflatex (attempt {i + 1}/2): {' '.join(current_cmd_to_run) if isinstance(current_cmd_to_run, list) else current_cmd_to_run}"
-            )
+            logger.info(f"Running pdflatex (attempt {i + 1}/2): {cmd_display}")
             result = subprocess.run(
-                current_cmd_to_run,
-                shell=shell,
-                capture_output=True,
-                text=True,  # Decode stdout/stderr as text
+                cmd_to_run,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 cwd=tex_file_path.parent,
             )
 
-            last_stdout = result.stdout
             last_stderr = result.stderr
 
             if result.returncode != 0:
+                if fmt_path is not None and self._format_failed(log_path):
+                    # The dumped preamble does not work for this document: compile it the regular way
+                    logger.warning(f"Compiling {tex_file_path} with {fmt_path.name} failed, retrying without it")
+                    with self._format_lock:
+                        self._formats[fmt_path.stem] = None
+                    return self.compile_tex_to_pdf(tex_file_path, output_directory)
                 error_message = (
                     f"Failed to compile {tex_file_path} to PDF on attempt {i + 1}.\n"
                     f"Return code: {result.returncode}\n"
                     f"Working directory: {tex_file_path.parent}\n"
-                    f"Command: {' '.join(current_cmd_to_run) if isinstance(current_cmd_to_run, list) else current_cmd_to_run}\n"
-                    f"STDOUT:\n{result.stdout}\n"
-                    f"STDERR:\n{result.stderr}"
+                    f"Command: {cmd_display}\n"
+                    f"LOG (last {_LOG_TAIL_LINES} lines):\n{self._read_log_tail(log_path)}\n"
+                    f"STDERR:\n{result.stderr.decode(errors='replace')}"
                 )
                 logger.error(error_message)
                 raise PDFCompilationError(error_message)
 
+            if i == 0 and not self._needs_second_pass(tex_file_path, log_path):
+                logger.info("Cross-references are already resolved, skipping the second pdflatex pass")
+                break
+
         if pdf_path.exists():
             logger.info(f"Successfully compiled {tex_file_path} to {pdf_path}")
             return pdf_path
@@ -104,9 +189,48 @@ class PDFCompiler:
         fallback_error_message = (
             f"Failed to compile {tex_file_path} to PDF. PDF not found after 2 attempts.\n"
             f"Working directory: {tex_file_path.parent}\n"
-            f"Command: {' '.join(cmd_to_run) if isinstance(cmd_to_run, list) else cmd_to_run}\n"
-            f"Last STDOUT:\n{last_stdout}\n"
-            f"Last STDERR:\n{last_stderr}"
+            f"Command: {cmd_display}\n"
+            f"Last LOG (last {_LOG_TAIL_LINES} lines):\n{self._read_log_tail(log_path)}\n"
+            f"Last STDERR:\n{last_stderr.decode(errors='replace')}"
         )
         logger.error(fallback_error_message)
         raise PDFCompilationError(fallback_error_message)
+
+    @staticmethod
+    def _needs_second_pass(tex_file_path: Path, log_path: Path) -> bool:
+        """
+        Decide whether pdflatex must run again after the first pass.
+
+        A rerun is needed when LaTeX asks for one, or when the document uses cross-references,
+        which are read back from the .aux file of the previous pass. Builds start from an empty
+        directory, so there is no earlier .aux to compare against; documents without such
+        commands are complete after one pass.
+        """
+        try:
+            if b"Rerun" in log_path.read_bytes():
+                return True
+        except FileNotFoundError:
+            pass
+        return _CROSS_REFERENCE_RE.search(tex_file_path.read_text(encoding="utf-8", errors="ignore")) is not None
+
+    @staticmethod
+    def _format_failed(log_path: Path) -> bool:
+        """
+        Tell whether a failed pdflatex run broke on its precompiled format rather than on the document.
+
+        A format that cannot be loaded stops pdflatex before it writes a .log; other format problems
+        are reported in it. Ordinary LaTeX errors leave the format in use.
+        """
+        try:
+            return _FORMAT_ERROR_RE.search(log_path.read_bytes()) is not None
+        except FileNotFoundError:
+            return True
+
+    @staticmethod
+    def _read_log_tail(log_path: Path) -> str:
+        """Return the last lines of a pdflatex .log file, where its error messages are."""
+        try:
+            lines = log_path.read_text(encoding="utf-8", errors="replace").splitlines()
+        except FileNotFoundError:
+            return "(no log file written)"
+        return "\n".join(lines[-_LOG_TAIL_LINES:])
@@ -1,4 +1,6 @@
+import asyncio
 import datetime
+import difflib
 import json
 import re
 from pathlib import Path
@@ -6,6 +8,7 @@ from typing import Any
 
 from src.common.services.notion_sync_service import NotionSyncService
 from src.common.services.openai_service import OpenAIService
+from src.common.utils import read_prompt_template
 from src.core.config import get_settings
 from src.core.logger import logger
 
@@ -16,25 +19,81 @@ DIFF_PAT = re.compile(
     r">>>>>>> SEARCH\n(.*?)\n=======\n(.*?)\n<<<<<<< REPLACE",
     re.S,  # dot matches newlines
 )
+DIFF_SEARCH_MARKER = ">>>>>>> SEARCH\n"
+DIFF_DIVIDER = "\n=======\n"
+DIFF_REPLACE_MARKER = "\n<<<<<<< REPLACE"
+# Lets the first page take a couple more lines; the preamble stays untouched so its format is reused
+TRIVIAL_OVERFLOW_FIX = "\\enlargethispage{2\\baselineskip}\n"
+
+
+class DiffBlockNotFoundError(ValueError):
+    """Raised by apply_diff when a SEARCH block does not occur in the source."""
+
+    def __init__(self, search: str, replace: str) -> None:
+        super().__init__(f"Search block not found:\n---\n{search}\n---")
+        self.search = search
+        self.replace = replace
+
+
+def format_diff_block(search: str, replace: str) -> str:
+    """Render a (search, replace) pair in the SEARCH/REPLACE format read by parse_diff_blocks."""
+    return f"{DIFF_SEARCH_MARKER}{search}{DIFF_DIVIDER}{replace}{DIFF_REPLACE_MARKER}"
+
+
+def find_source_snippet(src: str, search: str, context_lines: int = 2) -> str | None:
+    """Return the lines of src that most resemble a SEARCH block, with some context around them.
+
+    The first non-blank line of the block is fuzzy-matched against the source lines; None is
+    returned when nothing is close enough.
+    """
+    search_lines = [line for line in search.splitlines() if line.strip()]
+    if not search_lines:
+        return None
+    src_lines = src.splitlines()
+    stripped_lines = [line.strip() for line in src_lines]
+    matches = difflib.get_close_matches(search_lines[0].strip(), stripped_lines, n=1, cutoff=0.6)
+    if not matches:
+        return None
+    start = stripped_lines.index(matches[0])
+    end = start + len(search.splitlines()) + context_lines
+    return "\n".join(src_lines[max(0, start - context_lines) : end])
+
+
+def parse_diff_blocks(diff: str) -> list[tuple[str, str]]:
+    """Split an LLM diff into (search, replace) pairs with plain string splits.
+
+    Well-formed diffs never touch the regex engine; when any block is missing its divider or
+    closing marker, the whole diff is parsed with DIFF_PAT instead, as before.
+    """
+    blocks = []
+    for part in diff.split(DIFF_SEARCH_MARKER)[1:]:
+        body, closed, _ = part.partition(DIFF_REPLACE_MARKER)
+        search, divided, replace = body.partition(DIFF_DIVIDER)
+        if not (closed and divided):
+            return [(match.group(1), match.group(2)) for match in DIFF_PAT.finditer(diff)]
+        blocks.append((search, replace))
+    return blocks
 
 
 def apply_diff(src: str, diff: str) -> str:
-    def repl(match: re.Match[str]) -> str:
-        search, replace = match.group(1), match.group(2)
+    def repl(search: str, replace: str) -> str:
         if search == "<<EMPTY>>":  # pure insertion
-            return replace + "\n" + search  # keep sentinel for idempotency
+            return replace + "\n" + search + src  # keep sentinel for idempotency
 
-        # First try a literal substring replacement
-        occ = src.find(search.strip())
-        if occ != -1:
-            return src.replace(search, replace, 1)
+        # Literal substring replacement: partition finds and splits in a single scan
+        head, sep, tail = src.partition(search)
+        if sep:
+            return head + replace + tail
+        if src.find(search.strip()) != -1:
+            # Only matches once surrounding whitespace is ignored: left unchanged, as before
+            return src
 
         # If still not found, raise the same informative error as before
-        raise ValueError(f"Search block not found:\n---\n{search}\n---")
+        raise DiffBlockNotFoundError(search, replace)
 
     # iterate through all blocks in the diff
-    for block in DIFF_PAT.finditer(diff):
-        src = repl(block)
+    for search, replace in parse_diff_blocks(diff):
+        src = repl(search, replace)
     return src
 
 
@@ -63,15 +122,15 @@ class TailorService:
 
         # Load system prompt
         system_prompt_path = prompts_dir / settings.TAILOR_RESUME_SYSTEM_PROMPT_FILENAME
-        system_prompt = system_prompt_path.read_text(encoding="utf-8")
+        system_prompt = read_prompt_template(system_prompt_path)
 
         # Load and format user prompt
         user_prompt_path = prompts_dir / settings.TAILOR_RESUME_USER_PROMPT_FILENAME
-        user_prompt_template = user_prompt_path.read_text(encoding="utf-8")
+        user_prompt_template = read_prompt_template(user_prompt_path)
 
         # Load tailoring rules from file
         tailoring_rules_path = prompts_dir / settings.TAILORING_RULES_FILENAME
-        tailoring_rules = tailoring_rules_path.read_text(encoding="utf-8")
+        tailoring_rules = read_prompt_template(tailoring_rules_path)
         user_prompt = user_prompt_template.format(
             job_metadata_block=json.dumps(job_metadata, indent=2),
             tailoring_rules=tailoring_rules,
@@ -88,17 +147,30 @@ class TailorService:
             target_output_dir = base_output_dir / "runs" / f"{timestamp}_{safe_page_id}"
         target_output_dir.mkdir(parents=True, exist_ok=True)
 
+        # The tailored resume keeps the master's preamble: dump it into a pdflatex format from a
+        # worker thread while the LLM tailors, so the first compile starts from the format
+        master_resume_path = Path(settings.MASTER_RESUME_PATH)
+        format_future = asyncio.get_running_loop().run_in_executor(
+            None, self.latex_service.prepare_format, master_resume_path
+        )
+
         # Initial Diff Application and Compilation Loop
         max_diff_retries = settings.DIFF_MAX_RETRIES
         tailored_tex_content = master_resume_tex_content  # Start with master content
         final_tailored_tex_path = None
         compiled_tailored_pdf_path = None
 
+        llm_response: str | None = None
         for attempt in range(1, max_diff_retries + 1):
             # logger.info(f"Initial tailoring attempt {attempt}/{max_diff_retries}")
-            llm_response = self.openai_service.get_response(
-                system_prompt, user_prompt, model_name=settings.DEFAULT_MODEL_NAME
-            )
+            if llm_response is None:
+                # The OpenAI client is synchronous: wait for it from a worker thread so the event loop stays free
+                llm_response = await asyncio.to_thread(
+                    self.openai_service.get_response,
+                    system_prompt,
+                    user_prompt,
+                    model_name=settings.DEFAULT_MODEL_NAME,
+                )
             try:
                 current_tex_to_diff_against = (
                     master_resume_tex_content  # Always diff against original master for initial tailoring
@@ -110,7 +182,8 @@ class TailorService:
                     filename_stem=settings.TAILORED_RESUME_STEM,
                     target_directory=target_output_dir,
                 )
-                compiled_tailored_pdf_path = self.latex_service.compile_resume(final_tailored_tex_path)
+                await format_future
+                compiled_tailored_pdf_path = await self.latex_service.compile_resume_async(final_tailored_tex_path)
                 logger.info(f"Initial tailoring attempt {attempt} successful.")
                 break  # Successful initial tailoring and compilation
             except ValueError as e:
@@ -118,6 +191,13 @@ class TailorService:
                 if attempt == max_diff_retries:
                     logger.error(f"Failed to apply initial diff after {max_diff_retries} attempts.")
                     raise ValueError(f"Failed to apply initial diff after {max_diff_retries} attempts: {e}")
+                # An unmatched SEARCH block is repaired with a small prompt; other failures, a failed
+                # repair and the last attempt ask for a whole new diff
+                failed_response, llm_response = llm_response, None
+                if isinstance(e, DiffBlockNotFoundError) and attempt < max_diff_retries - 1:
+                    llm_response = await asyncio.to_thread(
+                        self._repair_diff, failed_response, e, master_resume_tex_content
+                    )
                 continue  # Retry initial tailoring
         else:
             # This else block executes if the loop completes without a break (all retries failed)
@@ -133,7 +213,9 @@ class TailorService:
 
                 if page_count > 1:
                     # `tailored_tex_content` and `compiled_tailored_pdf_path` will be updated by the helper method.
-                    tailored_tex_content, compiled_tailored_pdf_path = self._reduce_pdf_to_one_page(
+                    # LLM calls and compiles in a row: run the whole reduction loop off the event loop
+                    tailored_tex_content, compiled_tailored_pdf_path = await asyncio.to_thread(
+                        self._reduce_pdf_to_one_page,
                         current_tex_content=tailored_tex_content,
                         current_pdf_path=compiled_tailored_pdf_path,
                         initial_page_count=page_count,
@@ -162,50 +244,100 @@ class TailorService:
             # Consider raising an error here or ensuring subsequent steps handle this gracefully
             return  # Exit if no PDF was successfully generated
 
-        # 7. Remove all files from the resume property before uploading new file
-
-        # Clear existing files in the designated property by updating the page with an empty file list.
-        await self.notion_service.update_page(
-            notion_page_id,
-            {settings.TAILORED_RESUME_PROPERTY_NAME: {"files": []}},
+        # 9. Generate the diff .tex and .pdf in the background: the executor starts latexdiff and
+        # pdflatex in a worker thread right away, so they run while the tailored PDF is uploaded below
+        # even though the Notion upload blocks the event loop
+        diff_future = asyncio.get_running_loop().run_in_executor(
+            None,
+            self._build_diff_pdf,
+            Path(settings.MASTER_RESUME_PATH),
+            final_tailored_tex_path,
+            target_output_dir,
         )
 
-        # 8. Reset resume property and upload tailored PDF to Notion
-        if compiled_tailored_pdf_path and compiled_tailored_pdf_path.exists():
+        # 7-8. Upload tailored PDF to Notion, replacing any files already in the
+        # resume property (one PATCH instead of clear + fetch + append).
+        try:
             await self.notion_service.upload_file_to_page(
                 str(compiled_tailored_pdf_path),
                 notion_page_id,
                 settings.TAILORED_RESUME_PROPERTY_NAME,
+                replace_existing=True,
             )
-        else:
-            # Log an error or handle if PDF compilation failed
-            # logger.error(f"Failed to compile tailored PDF for {final_tailored_tex_path}")
-            pass
+        except BaseException:
+            diff_future.cancel()
+            raise
 
-        # 9. Generate diff .tex and .pdf, then upload diff PDF to Notion
-        master_resume_path = Path(settings.MASTER_RESUME_PATH)
+        # The diff PDF is appended only after the upload above replaced the property's files
+        compiled_diff_pdf_path = await diff_future
+        if compiled_diff_pdf_path and compiled_diff_pdf_path.exists():
+            await self.notion_service.upload_file_to_page(
+                str(compiled_diff_pdf_path),
+                notion_page_id,
+                settings.TAILORED_RESUME_PROPERTY_NAME,
+            )
+
+    def _repair_diff(self, diff: str, error: DiffBlockNotFoundError, src: str) -> str | None:
+        """
+        Ask a small model to fix the SEARCH block of ``diff`` that did not match ``src``.
 
+        Only the failed block and the source lines closest to it are sent, outside the tailoring
+        conversation. Returns the diff with that block replaced by the corrected one, or None when no
+        likely location is found or the repair does not yield a diff block.
+        """
+        settings = get_settings()
+        snippet = find_source_snippet(src, error.search)
+        if snippet is None:
+            return None
+
+        repair_prompt_template = read_prompt_template(
+            Path(settings.PROMPTS_DIRECTORY) / settings.DIFF_REPAIR_PROMPT_FILENAME
+        )
+        repair_prompt = repair_prompt_template.format(
+            failed_block=format_diff_block(error.search, error.replace),
+            source_snippet=snippet,
+        )
+        try:
+            repair_response = self.openai_service.get_response(
+                sys_prompt=None,
+                user_prompt=repair_prompt,
+                model_name=settings.DIFF_REPAIR_MODEL_NAME,
+                use_history=False,
+            )
+        except ValueError as e:
+            logger.warning(f"Diff repair request failed: {e}")
+            return None
+        repaired_blocks = parse_diff_blocks(repair_response)
+        if not repaired_blocks:
+            logger.warning("Diff repair response contained no diff block")
+            return None
+
+        blocks: list[tuple[str, str]] = []
+        repaired = False
+        for search, replace in parse_diff_blocks(diff):
+            if not repaired and search == error.search and replace == error.replace:
+                blocks.extend(repaired_blocks)
+                repaired = True
+            else:
+                blocks.append((search, replace))
+        logger.info("Retrying with a repaired SEARCH block instead of a new tailoring request")
+        return "\n".join(format_diff_block(search, replace) for search, replace in blocks)
+
+    def _build_diff_pdf(
+        self, master_resume_path: Path, tailored_tex_path: Path, target_output_dir: Path
+    ) -> Path | None:
+        """Run latexdiff between the master and tailored resumes and compile the result to PDF."""
+        settings = get_settings()
         diff_tex_result_path = self.latex_service.run_latexdiff(
             original_tex_path=master_resume_path,
-            tailored_tex_path=final_tailored_tex_path,
+            tailored_tex_path=tailored_tex_path,
             diff_output_stem=settings.TAILORED_RESUME_DIFF_STEM,  # e.g., "tailored_resume_diff"
             target_directory=target_output_dir,
         )
-
-        if diff_tex_result_path and diff_tex_result_path.exists():
-            # Compile diff .tex to .pdf (saved in the same directory as the diff .tex file)
-            compiled_diff_pdf_path = self.latex_service.compile_resume(diff_tex_result_path)
-
-            if compiled_diff_pdf_path and compiled_diff_pdf_path.exists():
-                await self.notion_service.upload_file_to_page(
-                    str(compiled_diff_pdf_path),
-                    notion_page_id,
-                    settings.TAILORED_RESUME_PROPERTY_NAME,
-                )
-            else:
-                # Log an error or handle if diff PDF compilation failed
-                # logger.error(f"Failed to compile diff PDF for {diff_tex_result_path}")
-                pass
+        if not (diff_tex_result_path and diff_tex_result_path.exists()):
+            return None
+        # Compile diff .tex to .pdf (saved in the same directory as the diff .tex file)
+        return self.latex_service.compile_resume(diff_tex_result_path)
 
     def _reduce_pdf_to_one_page(
         self,
@@ -221,14 +353,22 @@ class TailorService:
         loop_pdf_path = current_pdf_path
         loop_page_count = initial_page_count
 
+        # Cheap pass first: a few stray lines on page 2 are fixed without an LLM round trip
+        if loop_page_count == 2:
+            fitted = self._fit_trivial_overflow(loop_tex_content, loop_pdf_path, target_output_dir)
+            if fitted is not None:
+                loop_tex_content, loop_pdf_path, loop_page_count = fitted
+                if loop_page_count <= 1:
+                    logger.info("Reduced PDF to 1 page by enlarging the first page.")
+                    return loop_tex_content, loop_pdf_path
+
+        # Build reduction prompt from template instead of hardcoding
+        reduction_prompt_path = Path(settings.PROMPTS_DIRECTORY) / settings.PDF_REDUCTION_PROMPT_FILENAME
+        reduction_prompt_template = read_prompt_template(reduction_prompt_path)
+
         for reduction_attempt in range(1, settings.PDF_REDUCTION_MAX_RETRIES + 1):
             logger.info(f"PDF reduction attempt {reduction_attempt}/{settings.PDF_REDUCTION_MAX_RETRIES}")
 
-            # Build reduction prompt from template instead of hardcoding
-            prompts_dir = Path(settings.PROMPTS_DIRECTORY)
-            reduction_prompt_path = prompts_dir / settings.PDF_REDUCTION_PROMPT_FILENAME
-            reduction_prompt_template = reduction_prompt_path.read_text(encoding="utf-8")
-
             # Fill in template placeholders
             reduction_user_prompt = reduction_prompt_template.format(
                 page_count=str(loop_page_count),
@@ -272,3 +412,35 @@ class TailorService:
             )
 
         return loop_tex_content, loop_pdf_path
+
+    def _fit_trivial_overflow(
+        self, tex_content: str, pdf_path: Path, target_output_dir: Path
+    ) -> tuple[str, Path, int] | None:
+        """
+        Enlarge the first page when the second one only holds a trivial overflow.
+
+        Returns the patched content, its compiled PDF and page count, or None when the overflow is
+        not trivial (or cannot be inspected) and the LLM has to shorten the resume.
+        """
+        settings = get_settings()
+        try:
+            overflow_text = self.latex_service.get_text_from_pdf_page(pdf_path, 2)
+        except RuntimeError as e:
+            logger.warning(f"Could not inspect page 2 of {pdf_path}: {e}")
+            return None
+        if overflow_text is None or len(overflow_text.strip()) >= settings.TRIVIAL_OVERFLOW_MAX_CHARS:
+            return None
+
+        head, begin_document, body = tex_content.partition("\\begin{document}")
+        if not begin_document:
+            return None
+        patched_content = head + begin_document + "\n" + TRIVIAL_OVERFLOW_FIX + body.lstrip("\n")
+
+        logger.info(f"Page 2 only holds {len(overflow_text.strip())} characters, enlarging the first page.")
+        tex_path = self.latex_service.save_tex_file(
+            content=patched_content,
+            filename_stem=settings.TAILORED_RESUME_STEM,
+            target_directory=target_output_dir,
+        )
+        patched_pdf_path = self.latex_service.compile_resume(tex_path)
+        return patched_content, patched_pdf_path, self.latex_service.get_pdf_page_count(patched_pdf_path)
@@ -8,6 +8,7 @@ import pytest
 
 from src.common.exceptions.notion_exceptions import NotionFileError
 from src.common.services import NotionFileService
+from src.common.services.notion_file_service import _HTTP_SESSION
 
 
 @pytest.fixture
@@ -43,7 +44,7 @@ async def test_create_file_upload_object(file_service: NotionFileService) -> Non
         response.raise_for_status = MagicMock()
         return response
 
-    with patch("requests.post", side_effect=mock_post) as mock_post_func:
+    with patch("src.common.services.notion_file_service._HTTP_SESSION.post", side_effect=mock_post) as mock_post_func:
         upload_id, upload_url = await file_service.create_file_upload_object("test.txt", "text/plain")
         assert upload_id == "test-upload-id"
         assert upload_url == "https://example.com/upload"
@@ -58,7 +59,7 @@ async def test_upload_file_contents(file_service: NotionFileService, mock_file:
         response.raise_for_status = MagicMock()
         return response
 
-    with patch("requests.post", side_effect=mock_post) as mock_post_func:
+    with patch("src.common.services.notion_file_service._HTTP_SESSION.post", side_effect=mock_post) as mock_post_func:
         await file_service.upload_file_contents("https://example.com/upload", mock_file, "text/plain")
         mock_post_func.assert_called_once()
 
@@ -103,9 +104,9 @@ async def test_upload_file(file_service: NotionFileService, mock_file: Path) ->
         return response
 
     with (
-        patch("requests.post", side_effect=mock_post) as mock_post_func,
+        patch("src.common.services.notion_file_service._HTTP_SESSION.post", side_effect=mock_post) as mock_post_func,
         patch.object(NotionFileService, "get_existing_files", return_value=[]) as mock_get_files,
-        patch("requests.patch", side_effect=mock_patch) as mock_patch_func,
+        patch("src.common.services.notion_file_service._HTTP_SESSION.patch", side_effect=mock_patch) as mock_patch_func,
     ):
         await file_service.upload_file(
             mock_file,
@@ -117,9 +118,31 @@ async def test_upload_file(file_service: NotionFileService, mock_file: Path) ->
         mock_patch_func.assert_called()
 
 
+@pytest.mark.asyncio
+async def test_upload_file_replace_existing_skips_fetch(file_service: NotionFileService, mock_file: Path) -> None:
+    post_response = MagicMock()
+    post_response.json = MagicMock(return_value={"id": "test-upload-id", "upload_url": "https://example.com/upload"})
+    patch_response = MagicMock()
+    patch_response.json = MagicMock(return_value={"object": "page", "id": "test-page-id"})
+
+    with (
+        patch("src.common.services.notion_file_service._HTTP_SESSION.post", return_value=post_response),
+        patch.object(NotionFileService, "get_existing_files") as mock_get_files,
+        patch(
+            "src.common.services.notion_file_service._HTTP_SESSION.patch", return_value=patch_response
+        ) as mock_patch_func,
+    ):
+        result = await file_service.upload_file(mock_file, "test-page-id", "test-property", replace_existing=True)
+
+    mock_get_files.assert_not_called()
+    sent_files = mock_patch_func.call_args.kwargs["json"]["properties"]["test-property"]["files"]
+    assert sent_files == [{"type": "file_upload", "file_upload": {"id": "test-upload-id"}, "name": mock_file.name}]
+    assert result == {"object": "page", "id": "test-page-id"}
+
+
 @pytest.mark.asyncio
 async def test_create_file_upload_object_error(file_service: NotionFileService) -> None:
-    with patch("requests.post", side_effect=Exception("API Error")):
+    with patch("src.common.services.notion_file_service._HTTP_SESSION.post", side_effect=Exception("API Error")):
         with pytest.raises(NotionFileError) as exc_info:
             await file_service.create_file_upload_object("test.txt", "text/plain")
         assert "Failed to create file upload object" in str(exc_info.value)
@@ -127,7 +150,7 @@ async def test_create_file_upload_object_error(file_service: NotionFileService)
 
 @pytest.mark.asyncio
 async def test_upload_file_contents_error(file_service: NotionFileService, mock_file: Path) -> None:
-    with patch("requests.post", side_effect=Exception("Upload Error")):
+    with patch("src.common.services.notion_file_service._HTTP_SESSION.post", side_effect=Exception("Upload Error")):
         with pytest.raises(NotionFileError) as exc_info:
             await file_service.upload_file_contents("https://example.com/upload", mock_file, "text/plain")
         assert "Failed to upload file contents" in str(exc_info.value)
@@ -135,7 +158,7 @@ async def test_upload_file_contents_error(file_service: NotionFileService, mock_
 
 @pytest.mark.asyncio
 async def test_upload_file_error(file_service: NotionFileService, mock_file: Path) -> None:
-    with patch("requests.post", side_effect=Exception("API Error")):
+    with patch("src.common.services.notion_file_service._HTTP_SESSION.post", side_effect=Exception("API Error")):
         with pytest.raises(NotionFileError) as exc_info:
             await file_service.upload_file(
                 mock_file,
@@ -188,7 +211,7 @@ async def test_get_existing_files_success(file_service: NotionFileService) -> No
         response.raise_for_status = MagicMock()
         return response
 
-    with patch("requests.get", side_effect=mock_get):
+    with patch("src.common.services.notion_file_service._HTTP_SESSION.get", side_effect=mock_get):
         files = await file_service.get_existing_files("page-id", "resume")
         assert isinstance(files, list)
         assert files and files[0]["name"] == "file.pdf"
@@ -198,6 +221,47 @@ async def test_get_existing_files_success(file_service: NotionFileService) -> No
 async def test_get_existing_files_error(file_service: NotionFileService) -> None:
     """Should return empty list when GET fails."""
 
-    with patch("requests.get", side_effect=Exception("API Error")):
+    with patch("src.common.services.notion_file_service._HTTP_SESSION.get", side_effect=Exception("API Error")):
         files = await file_service.get_existing_files("page-id", "resume")
         assert files == []
+
+
+@pytest.mark.asyncio
+async def test_upload_bytes(file_service: NotionFileService) -> None:
+    post_response = MagicMock()
+    post_response.json = MagicMock(return_value={"id": "test-upload-id", "upload_url": "https://example.com/upload"})
+    patch_response = MagicMock()
+    patch_response.json = MagicMock(return_value={"object": "page", "id": "test-page-id"})
+
+    with (
+        patch(
+            "src.common.services.notion_file_service._HTTP_SESSION.post", return_value=post_response
+        ) as mock_post_func,
+        patch.object(NotionFileService, "get_existing_files", return_value=[]),
+        patch("src.common.services.notion_file_service._HTTP_SESSION.patch", return_value=patch_response),
+    ):
+        result = await file_service.upload_bytes(b"# Job", "job.txt", "test-page-id", "test-property")
+
+    assert mock_post_func.call_args_list[0].kwargs["json"] == {"filename": "job.txt", "content_type": "text/plain"}
+    assert mock_post_func.call_args_list[1].kwargs["files"] == {"file": ("job.txt", b"# Job", "text/plain")}
+    assert result == {"object": "page", "id": "test-page-id"}
+
+
+@pytest.mark.asyncio
+async def test_download_file_uses_pooled_session(file_service: NotionFileService) -> None:
+    """Test that downloads go through the shared session with a timeout."""
+    response = MagicMock(content=b"%PDF")
+
+    with patch("src.common.services.notion_file_service._HTTP_SESSION.get", return_value=response) as mock_get:
+        result = await file_service.download_file("https://files.example.com/resume.pdf")
+
+    assert result == b"%PDF"
+    mock_get.assert_called_once_with("https://files.example.com/resume.pdf", timeout=(5, 30))
+
+
+def test_http_session_mounts_retrying_adapter() -> None:
+    """Test that the module session pools and retries HTTPS connections."""
+    adapter = _HTTP_SESSION.get_adapter("https://api.notion.com/v1/pages")
+
+    assert adapter.max_retries.total == 3
+    assert 429 in adapter.max_retries.status_forcelist
@@ -71,6 +71,7 @@ def mock_file_service() -> MagicMock:
     """Create a mock NotionFileService."""
     service = MagicMock()
     service.upload_file = AsyncMock()
+    service.upload_bytes = AsyncMock()
     return service
 
 
@@ -196,11 +197,14 @@ async def test_upload_file_to_page(
             },
         },
     }
-    mock_api_service.get_page.return_value = NotionPage.model_validate(mock_data)
-    mock_api_service.update_page.return_value = NotionPage.model_validate(mock_data)
+    mock_file_service.upload_file.return_value = mock_data
 
-    await sync_service.upload_file_to_page(str(file_path), "test-page-id", "test-property")
-    mock_file_service.upload_file.assert_called_once_with(str(file_path), "test-page-id", "test-property")
+    result = await sync_service.upload_file_to_page(str(file_path), "test-page-id", "test-property")
+    mock_file_service.upload_file.assert_called_once_with(
+        str(file_path), "test-page-id", "test-property", replace_existing=False
+    )
+    mock_api_service.get_page.assert_not_called()
+    assert result.id == "test-page-id"
 
 
 @pytest.mark.asyncio
@@ -352,3 +356,20 @@ async def test_save_or_update_extracted_data_error(
     with pytest.raises(NotionAPIError) as exc_info:
         await sync_service.save_or_update_extracted_data("test-db-id", "https://example.com", {})
     assert "Failed to save or update extracted data" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_get_database_schema_dumps_cached_database_once(
+    sync_service: NotionSyncService, mock_api_service: MagicMock
+) -> None:
+    """Test that the plain-dict schema is reused until a different database is cached."""
+    sync_service._cached_database = await sync_service.get_database("test-db-id")
+
+    first = sync_service.get_database_schema()
+    second = sync_service.get_database_schema()
+
+    assert first is second
+    assert first["Job Title"]["type"] == "title"
+
+    sync_service._cached_database = sync_service._cached_database.model_copy()
+    assert sync_service.get_database_schema() is not first
@@ -1,9 +1,11 @@
 """Tests for the OpenAI service module."""
 
+import asyncio
 from collections.abc import Generator
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import openai
+import orjson
 import pytest
 
 from src.common.services.openai_service import OpenAIService
@@ -12,6 +14,15 @@ from src.common.services.openai_service import OpenAIService
 class TestOpenAIService:
     """Test suite for the OpenAIService class."""
 
+    @pytest.fixture(autouse=True)
+    def mock_settings(self) -> Generator[MagicMock]:
+        """Provide retry/timeout settings without requiring a populated environment."""
+        with patch("src.common.services.openai_service.get_settings") as mock_get_settings:
+            mock_get_settings.return_value = MagicMock(
+                OPENAI_MAX_RETRIES=3, OPENAI_TIMEOUT_SECONDS=30, API_RETRY_DELAY_SECONDS=1.0
+            )
+            yield mock_get_settings
+
     @pytest.fixture
     def mock_client(self) -> Generator[MagicMock]:
         """Create a mock OpenAI client with realistic response structure from API docs."""
@@ -71,6 +82,36 @@ class TestOpenAIService:
         assert response == "Test response"
         assert service.response_id == "resp_test123"  # Should be set after first call
 
+    def test_get_response_without_history_leaves_conversation_untouched(self, mock_client: MagicMock) -> None:
+        """Test that standalone requests are not chained to, nor replace, the previous response."""
+        service = OpenAIService(api_key="test-api-key", temperature=0.7)
+        service.response_id = "resp_conversation"
+
+        service.get_response(sys_prompt=None, user_prompt="Fix this block", model_name="gpt-4o", use_history=False)
+
+        call_args = mock_client.return_value.responses.create.call_args[1]
+        assert call_args["previous_response_id"] == openai.NOT_GIVEN
+        assert service.response_id == "resp_conversation"
+
+    def test_get_structured_response_without_history_leaves_conversation_untouched(
+        self, mock_client: MagicMock
+    ) -> None:
+        """Test that standalone structured requests are not chained to, nor replace, the previous response."""
+        mock_client.return_value.responses.create.return_value = type(
+            "Response", (), {"id": "resp_extraction", "error": None, "output_text": '{"foo": "bar"}'}
+        )()
+        service = OpenAIService(api_key="test-api-key", temperature=0.7)
+        service.response_id = "resp_conversation"
+
+        result = service.get_structured_response(
+            sys_prompt="Extract", user_prompt=None, model_name="gpt-4o", schema={}, use_history=False
+        )
+
+        call_args = mock_client.return_value.responses.create.call_args[1]
+        assert call_args["previous_response_id"] == openai.NOT_GIVEN
+        assert service.response_id == "resp_conversation"
+        assert result == {"foo": "bar"}
+
     def test_get_response_raises_if_both_prompts_none(self, mock_client: MagicMock) -> None:
         """Test that get_response raises ValueError if both sys_prompt and user_prompt are None."""
         service = OpenAIService(api_key="test-api-key", temperature=0.7)
@@ -145,3 +186,199 @@ class TestOpenAIService:
             service.get_response(sys_prompt=None, user_prompt="Test prompt", model_name="gpt-4o")
 
         assert "Error getting response: Connection error" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_get_structured_response_async_retries_rate_limits(self, mock_client: MagicMock) -> None:
+        """Test that the async structured call backs off on 429s and does not chain response IDs."""
+        # Arrange
+        ok_response = type("Response", (), {"id": "resp_ok", "error": None, "output_text": '{"foo": "bar"}'})()
+        rate_limited = openai.RateLimitError("slow down", response=MagicMock(status_code=429), body=None)
+        schema = {"type": "object", "properties": {"foo": {"type": "string"}}, "required": ["foo"]}
+
+        with (
+            patch("openai.AsyncOpenAI") as mock_async_client,
+            patch("src.common.services.openai_service.asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+        ):
+            mock_async_client.return_value.responses.create = AsyncMock(side_effect=[rate_limited, ok_response])
+            service = OpenAIService(api_key="test-api-key", temperature=0.7, retry_delay_seconds=0.5)
+
+            # Act
+            result = await service.get_structured_response_async(
+                sys_prompt="Extract", user_prompt=None, model_name="gpt-4o", schema=schema
+            )
+
+        # Assert
+        assert result == {"foo": "bar"}
+        mock_sleep.assert_awaited_once_with(0.5)
+        call_args = mock_async_client.return_value.responses.create.call_args[1]
+        assert "previous_response_id" not in call_args
+        assert service.response_id is None
+        client_kwargs = mock_async_client.call_args.kwargs
+        assert client_kwargs["api_key"] == "test-api-key"
+        assert client_kwargs["max_retries"] == 0
+        assert client_kwargs["timeout"] == 30
+
+    @pytest.mark.asyncio
+    async def test_get_structured_response_async_retries_connection_and_server_errors(
+        self, mock_client: MagicMock
+    ) -> None:
+        """Test that the async structured call also retries dropped connections and 5xx responses."""
+        ok_response = type("Response", (), {"id": "resp_ok", "error": None, "output_text": '{"foo": "bar"}'})()
+        connection_error = openai.APIConnectionError(request=MagicMock())
+        server_error = openai.InternalServerError("oops", response=MagicMock(status_code=503), body=None)
+
+        with (
+            patch("openai.AsyncOpenAI") as mock_async_client,
+            patch("src.common.services.openai_service.asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+        ):
+            mock_async_client.return_value.responses.create = AsyncMock(
+                side_effect=[connection_error, server_error, ok_response]
+            )
+            service = OpenAIService(api_key="test-api-key", max_retries=3, retry_delay_seconds=0.5)
+
+            result = await service.get_structured_response_async(
+                sys_prompt="Extract", user_prompt=None, model_name="gpt-4o", schema={}
+            )
+
+        assert result == {"foo": "bar"}
+        assert mock_sleep.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_async_client_from_another_loop_is_closed_when_replaced(self, mock_client: MagicMock) -> None:
+        """Test that a client bound to a finished event loop is closed before a new one is created."""
+        old_loop = asyncio.new_event_loop()
+        old_loop.close()
+        stale_client = MagicMock(close=AsyncMock())
+        service = OpenAIService(api_key="test-api-key")
+        service._async_client = stale_client
+        service._async_client_loop = old_loop
+
+        with patch("openai.AsyncOpenAI") as mock_async_client:
+            client = await service._get_async_client()
+
+        stale_client.close.assert_awaited_once()
+        assert client is mock_async_client.return_value
+        assert service._async_client_loop is asyncio.get_running_loop()
+
+    @pytest.mark.asyncio
+    async def test_get_structured_response_async_gives_up_after_max_retries(self, mock_client: MagicMock) -> None:
+        """Test that the async structured call raises once every attempt has been rate limited."""
+        # Arrange
+        rate_limited = openai.RateLimitError("slow down", response=MagicMock(status_code=429), body=None)
+        schema = {"type": "object", "properties": {"foo": {"type": "string"}}, "required": ["foo"]}
+
+        with (
+            patch("openai.AsyncOpenAI") as mock_async_client,
+            patch("src.common.services.openai_service.asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+        ):
+            mock_async_client.return_value.responses.create = AsyncMock(side_effect=rate_limited)
+            service = OpenAIService(api_key="test-api-key", max_retries=2, retry_delay_seconds=0.5)
+
+            # Act & Assert
+            with pytest.raises(ValueError, match="after 2 attempts"):
+                await service.get_structured_response_async(
+                    sys_prompt="Extract", user_prompt=None, model_name="gpt-4o", schema=schema
+                )
+
+        assert mock_async_client.return_value.responses.create.await_count == 2
+        mock_sleep.assert_awaited_once_with(0.5)
+
+    def test_create_structured_batch_uploads_jsonl(self, mock_client: MagicMock) -> None:
+        """Test that a batch uploads one Responses API request per prompt and returns the batch ID."""
+        # Arrange
+        client = mock_client.return_value
+        client.files.create.return_value = MagicMock(id="file_in")
+        client.batches.create.return_value = MagicMock(id="batch_1")
+        schema = {"type": "object", "properties": {"foo": {"type": "string"}}, "required": ["foo"]}
+        service = OpenAIService(api_key="test-api-key", temperature=0.2)
+
+        # Act
+        batch_id = service.create_structured_batch({"0": "first", "1": "second"}, "gpt-4o", schema)
+
+        # Assert
+        assert batch_id == "batch_1"
+        file_name, payload = client.files.create.call_args.kwargs["file"]
+        lines = [orjson.loads(line) for line in payload.splitlines()]
+        assert [line["custom_id"] for line in lines] == ["0", "1"]
+        assert lines[1]["url"] == "/v1/responses"
+        assert lines[1]["body"]["input"] == [{"role": "system", "content": "second"}]
+        assert lines[1]["body"]["text"]["format"]["schema"] == schema
+        client.batches.create.assert_called_once_with(
+            input_file_id="file_in", endpoint="/v1/responses", completion_window="24h"
+        )
+
+    def test_get_structured_batch_results(self, mock_client: MagicMock) -> None:
+        """Test that batch results are None while running and parsed per custom ID once completed."""
+        # Arrange
+        client = mock_client.return_value
+        body = {
+            "id": "resp_1",
+            "object": "response",
+            "created_at": 1741476542,
+            "model": "gpt-4o",
+            "output": [
+                {
+                    "id": "msg_1",
+                    "type": "message",
+                    "role": "assistant",
+                    "status": "completed",
+                    "content": [{"type": "output_text", "text": '{"foo": "bar"}', "annotations": []}],
+                }
+            ],
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+        }
+        output = b"\n".join(
+            [
+                orjson.dumps({"custom_id": "0", "response": {"status_code": 200, "body": body}, "error": None}),
+                orjson.dumps({"custom_id": "1", "response": {"status_code": 500, "body": {}}, "error": None}),
+            ]
+        )
+        client.batches.retrieve.side_effect = [
+            MagicMock(status="in_progress"),
+            MagicMock(status="completed", output_file_id="file_out"),
+        ]
+        client.files.content.return_value = MagicMock(text=output.decode())
+        service = OpenAIService(api_key="test-api-key")
+
+        # Act
+        running = service.get_structured_batch_results("batch_1")
+        finished = service.get_structured_batch_results("batch_1")
+
+        # Assert
+        assert running is None
+        assert finished == {"0": {"foo": "bar"}}
+        client.files.content.assert_called_once_with("file_out")
+
+    def test_get_structured_batch_results_raises_on_failed_batch(self, mock_client: MagicMock) -> None:
+        """Test that a failed batch raises instead of looking like a running one."""
+        mock_client.return_value.batches.retrieve.return_value = MagicMock(status="failed")
+        service = OpenAIService(api_key="test-api-key")
+
+        with pytest.raises(ValueError, match="ended with status 'failed'"):
+            service.get_structured_batch_results("batch_1")
+
+    def test_get_structured_response_rejects_non_object_output(self, mock_client: MagicMock) -> None:
+        """Test that structured output decoding to a non-object raises instead of being coerced."""
+        mock_client.return_value.responses.create.return_value = type(
+            "Response", (), {"id": "resp_list", "error": None, "output_text": "[1, 2]"}
+        )()
+        service = OpenAIService(api_key="test-api-key")
+
+        with pytest.raises(ValueError, match="not a JSON object: list"):
+            service.get_structured_response(sys_prompt="Extract", user_prompt=None, model_name="gpt-4o", schema={})
+
+    @pytest.mark.asyncio
+    async def test_async_client_uses_http2_when_h2_is_installed(self, mock_client: MagicMock) -> None:
+        """Test that the async client's transport negotiates HTTP/2 only when h2 is available."""
+        for available in (True, False):
+            with (
+                patch("openai.AsyncOpenAI") as mock_async_client,
+                patch("src.common.services.openai_service._http2_available", return_value=available),
+                patch("openai.DefaultAsyncHttpxClient") as mock_http_client,
+            ):
+                await OpenAIService(api_key="test-api-key")._get_async_client()
+
+            mock_http_client.assert_called_once_with(http2=available)
+            assert mock_async_client.call_args.kwargs["http_client"] is mock_http_client.return_value
@@ -6,6 +6,7 @@ import os
 import tempfile
 from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -128,3 +129,59 @@ def test_replace_prompt_placeholders_partial_replacement() -> None:
 
     # MISSING placeholder should remain unchanged
     assert "{{MISSING}}" in result
+
+
+def test_split_prompt_template_renders_around_placeholder() -> None:
+    """Test that split_prompt_template fills static placeholders and splits on the dynamic one."""
+    template = "Date: {{CURRENT_DATE}}. Content: {{CONTENT}}. URL: {{URL}}."
+    prefix, suffix = utils.split_prompt_template(template, "CONTENT", URL="https://example.com")
+
+    current_date = datetime.now().strftime("%B %d, %Y")
+    assert prefix == f"Date: {current_date}. Content: "
+    assert suffix == ". URL: https://example.com."
+    assert prefix + "Sample content" + suffix == utils.replace_prompt_placeholders(
+        template, CONTENT="Sample content", URL="https://example.com"
+    )
+
+
+def test_split_prompt_template_without_placeholder() -> None:
+    """Test that a template without the placeholder is returned whole as the prefix."""
+    assert utils.split_prompt_template("No dynamic part", "CONTENT") == ("No dynamic part", "")
+
+
+def test_read_prompt_template_caches_content() -> None:
+    """Test that read_prompt_template reads each file once until the cache is cleared."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        prompt_path = Path(temp_dir) / "prompt.txt"
+        prompt_path.write_text("first", encoding="utf-8")
+        utils.read_prompt_template.cache_clear()
+
+        assert utils.read_prompt_template(prompt_path) == "first"
+        prompt_path.write_text("second", encoding="utf-8")
+        assert utils.read_prompt_template(prompt_path) == "first"
+
+        utils.read_prompt_template.cache_clear()
+        assert utils.read_prompt_template(prompt_path) == "second"
+
+
+def test_run_async_and_new_event_loop_use_uvloop_when_installed() -> None:
+    """Test that the event-loop helpers pick uvloop when available and fall back to asyncio otherwise."""
+    uvloop = pytest.importorskip("uvloop")
+
+    async def answer() -> int:
+        return 42
+
+    assert utils.run_async(answer()) == 42
+    loop = utils.new_event_loop()
+    try:
+        assert isinstance(loop, uvloop.Loop)
+    finally:
+        loop.close()
+
+    with patch.object(utils, "_load_uvloop", return_value=None):
+        loop = utils.new_event_loop()
+        try:
+            assert not isinstance(loop, uvloop.Loop)
+        finally:
+            loop.close()
+        assert utils.run_async(answer()) == 42
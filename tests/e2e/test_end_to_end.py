@@ -20,6 +20,7 @@ class TestEndToEnd:
         settings.MASTER_RESUME_PATH = tmp_path / "master_resume.tex"
         settings.DEFAULT_MODEL_NAME = "gpt-4"
         settings.LOG_LEVEL = "INFO"
+        settings.CACHE_ENABLED = False
         return settings
 
     @pytest.fixture
@@ -70,14 +71,14 @@ class TestEndToEnd:
             mock_notion_instance.is_database_verified = AsyncMock(return_value=True)
 
             mock_extractor_instance = mock_extractor.return_value
-            mock_extractor_instance.extract_metadata_from_job_url.return_value = mock_job_metadata
+            mock_extractor_instance.extract_metadata_from_job_url_async = AsyncMock(return_value=mock_job_metadata)
 
             # Execute main function
             main()
 
             # Verify the complete workflow
             mock_notion_instance.get_database_schema.assert_called_once()
-            mock_extractor_instance.extract_metadata_from_job_url.assert_called_once_with(
+            mock_extractor_instance.extract_metadata_from_job_url_async.assert_awaited_once_with(
                 "https://example.com/job/123", mock_notion_instance.get_database_schema.return_value, "gpt-4"
             )
             mock_notion_instance.save_or_update_extracted_data.assert_called_once()
@@ -1,17 +1,31 @@
 """Tests for the ExtractorService class."""
 
-from collections.abc import Generator
+import asyncio
+import subprocess
+import sys
+import threading
+from collections.abc import AsyncIterator, Generator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src.metadata_extraction.extractor_service import ExtractorService
+from src.metadata_extraction.extractor_service import ExtractorService, ExtractorServiceError
+from src.metadata_extraction.response_cache import ExtractionResponseCache
+from src.metadata_extraction.schema_utils import create_openai_schema_from_notion_database
 
 
 class TestExtractorService:
     """Test suite for the ExtractorService class."""
 
+    @pytest.fixture(autouse=True)
+    def no_disk_cache(self) -> Generator[None]:
+        """Keep tests off the on-disk response cache unless they pass one explicitly."""
+        with patch.object(ExtractionResponseCache, "from_settings", return_value=None):
+            yield
+
     @pytest.fixture
     def mock_openai_client(self) -> Generator[MagicMock]:
         """Create a mock OpenAI client."""
@@ -63,6 +77,11 @@ class TestExtractorService:
             "Last Edited": {"id": "edited", "type": "last_edited_time"},
         }
 
+    @pytest.fixture
+    def title_only_schema(self) -> dict[str, Any]:
+        """Create a minimal Notion schema whose extraction output is easy to fake."""
+        return {"Job Title": {"id": "title", "type": "title"}}
+
     @pytest.fixture
     def sample_job_description(self) -> str:
         """Create a sample job description for testing."""
@@ -99,3 +118,505 @@ class TestExtractorService:
         # Assert
         assert service.openai_service == mock_openai_client
         assert service.notion_service == mock_notion_service
+
+    def test_crawl4ai_is_imported_lazily(self) -> None:
+        """Test that importing the extractor module does not import crawl4ai."""
+        code = (
+            "import sys; import src.metadata_extraction.extractor_service; "
+            "sys.exit(1 if 'crawl4ai' in sys.modules else 0)"
+        )
+
+        assert subprocess.run([sys.executable, "-c", code], check=False).returncode == 0
+
+    def test_default_crawl_configs_are_built_once(self, mock_openai_client: MagicMock) -> None:
+        """Test that configs without overrides are reused while overrides build fresh ones."""
+        # Arrange
+        service = ExtractorService(mock_openai_client)
+
+        # Act
+        with patch("src.metadata_extraction.extractor_service._load_crawl4ai") as load_crawl4ai:
+            crawl4ai = load_crawl4ai.return_value
+            crawl4ai.BrowserConfig.side_effect = lambda **kwargs: MagicMock()
+            crawl4ai.CrawlerRunConfig.side_effect = lambda **kwargs: MagicMock()
+            browser_configs = [service._create_browser_config(), service._create_browser_config()]
+            run_configs = [service._create_run_config(), service._create_run_config()]
+            streaming_config = service._create_run_config({"stream": True})
+
+        # Assert
+        assert browser_configs[0] is browser_configs[1]
+        assert run_configs[0] is run_configs[1]
+        assert streaming_config is not run_configs[0]
+        assert crawl4ai.BrowserConfig.call_count == 1
+        assert crawl4ai.CrawlerRunConfig.call_count == 2
+
+    def test_compact_markdown_strips_whitespace_and_truncates(self) -> None:
+        """Test that blank-line runs and trailing spaces are dropped and content is capped."""
+        settings = MagicMock(MAX_CONTENT_LENGTH_CHARS=15)
+
+        with patch("src.metadata_extraction.extractor_service.get_settings", return_value=settings):
+            short = ExtractorService._compact_markdown("  # Job   \n\n\n\nPython\t\n")
+            truncated = ExtractorService._compact_markdown("a" * 20)
+
+        assert short == "# Job\n\nPython"
+        assert truncated == "a" * 15
+
+    def test_init_precomputes_openai_schema(
+        self, mock_openai_client: MagicMock, sample_notion_schema: dict[str, Any]
+    ) -> None:
+        """Test that a schema given at init is converted once and reused for matching calls."""
+        # Arrange
+        service = ExtractorService(mock_openai_client, notion_database_schema=sample_notion_schema)
+
+        # Act
+        with patch(
+            "src.metadata_extraction.extractor_service.create_openai_schema_from_notion_database"
+        ) as create_schema:
+            precomputed = service._get_openai_schema(sample_notion_schema)
+            service._get_openai_schema({"Job Title": {"id": "title", "type": "title"}})
+
+        # Assert
+        assert precomputed is service._openai_schema
+        create_schema.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_extract_metadata_from_job_urls_async_runs_each_url_once(
+        self, mock_openai_client: MagicMock, title_only_schema: dict[str, Any]
+    ) -> None:
+        """Test that batch extraction crawls every unique URL in one batch and returns results keyed by URL."""
+        # Arrange
+        mock_openai_client.get_structured_response_async = AsyncMock(
+            side_effect=lambda **kwargs: {"Job Title": kwargs["sys_prompt"]}
+        )
+        service = ExtractorService(mock_openai_client)
+        urls = ["https://example.com/a", "https://example.com/b", "https://example.com/a"]
+
+        async def fake_crawl_stream(job_urls: list[str], _: int) -> AsyncIterator[tuple[str, str]]:
+            # Complete out of order to check that results are keyed by URL
+            for url in reversed(job_urls):
+                yield url, f"md:{url}"
+
+        # Act
+        with (
+            patch.object(service, "_crawl_markdown_stream", side_effect=fake_crawl_stream) as crawl,
+            patch.object(service, "_prepare_extraction_prompt", side_effect=lambda md: f"prompt:{md}"),
+        ):
+            result = await service.extract_metadata_from_job_urls_async(urls, title_only_schema, "gpt-4o", 2)
+
+        # Assert
+        crawl.assert_called_once_with(["https://example.com/a", "https://example.com/b"], 2)
+        assert result == {
+            "https://example.com/a": {"Job Title": "prompt:md:https://example.com/a"},
+            "https://example.com/b": {"Job Title": "prompt:md:https://example.com/b"},
+        }
+
+    @pytest.mark.asyncio
+    async def test_extract_metadata_from_job_urls_async_wraps_errors(
+        self, mock_openai_client: MagicMock, sample_notion_schema: dict[str, Any]
+    ) -> None:
+        """Test that a crawl failure surfaces as an ExtractorServiceError."""
+        service = ExtractorService(mock_openai_client)
+
+        async def failing_crawl_stream(job_urls: list[str], _: int) -> AsyncIterator[tuple[str, str]]:
+            raise RuntimeError("boom")
+            yield  # pragma: no cover - makes this an async generator
+
+        with patch.object(service, "_crawl_markdown_stream", side_effect=failing_crawl_stream):
+            with pytest.raises(ExtractorServiceError, match="Error while crawling job URLs: boom"):
+                await service.extract_metadata_from_job_urls_async(
+                    ["https://example.com/a"], sample_notion_schema, "gpt-4o", 1
+                )
+
+    @pytest.mark.asyncio
+    async def test_extract_metadata_from_job_urls_async_cancels_pending_on_failure(
+        self, mock_openai_client: MagicMock, sample_notion_schema: dict[str, Any]
+    ) -> None:
+        """Test that one failing URL cancels the extractions still in flight."""
+        # Arrange
+        service = ExtractorService(mock_openai_client)
+        cancelled = asyncio.Event()
+
+        async def fake_llm(sys_prompt: str, **kwargs: Any) -> dict[str, Any]:
+            if sys_prompt.endswith("/bad"):
+                raise RuntimeError("boom")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return {}
+
+        mock_openai_client.get_structured_response_async = AsyncMock(side_effect=fake_llm)
+
+        async def fake_crawl_stream(job_urls: list[str], _: int) -> AsyncIterator[tuple[str, str]]:
+            for url in job_urls:
+                yield url, url
+
+        # Act & Assert
+        with (
+            patch.object(service, "_crawl_markdown_stream", side_effect=fake_crawl_stream),
+            patch.object(service, "_prepare_extraction_prompt", side_effect=lambda md: md),
+        ):
+            with pytest.raises(ExtractorServiceError, match="/bad: boom"):
+                await service.extract_metadata_from_job_urls_async(
+                    ["https://example.com/slow", "https://example.com/bad"], sample_notion_schema, "gpt-4o", 2
+                )
+
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_extract_metadata_from_job_urls_async_rejects_invalid_concurrency(
+        self, mock_openai_client: MagicMock, sample_notion_schema: dict[str, Any]
+    ) -> None:
+        """Test that a non-positive concurrency limit is rejected up front."""
+        service = ExtractorService(mock_openai_client)
+
+        with pytest.raises(ExtractorServiceError, match="max_concurrency must be at least 1"):
+            await service.extract_metadata_from_job_urls_async(
+                ["https://example.com/a"], sample_notion_schema, "gpt-4o", 0
+            )
+
+    def test_crawl_markdown_reuses_persistent_crawler(self, mock_openai_client: MagicMock) -> None:
+        """Test that sync crawls share one browser on the background loop until close() is called."""
+        # Arrange
+        service = ExtractorService(mock_openai_client)
+        crawl_result = MagicMock(success=True, markdown="# Job")
+
+        with (
+            patch("src.metadata_extraction.extractor_service._load_crawl4ai") as load_crawl4ai,
+            patch.object(service, "_create_browser_config"),
+            patch.object(service, "_create_run_config"),
+        ):
+            mock_crawler_cls = load_crawl4ai.return_value.AsyncWebCrawler
+            load_crawl4ai.return_value.CrawlResultContainer = MagicMock
+            crawler = mock_crawler_cls.return_value
+            crawler.start = AsyncMock()
+            crawler.arun = AsyncMock(return_value=crawl_result)
+            crawler.close = AsyncMock()
+
+            # Act
+            with patch("src.metadata_extraction.extractor_service.atexit") as mock_atexit:
+                first = service._crawl_markdown("https://example.com/a")
+                second = service._crawl_markdown("https://example.com/b")
+                service.close()
+
+        # Assert
+        assert first == second == "# Job"
+        mock_crawler_cls.assert_called_once()
+        crawler.start.assert_awaited_once()
+        assert crawler.arun.await_count == 2
+        crawler.close.assert_awaited_once()
+        assert service._crawler_loop is None
+        mock_atexit.register.assert_called_once_with(service.close)
+        mock_atexit.unregister.assert_called_once_with(service.close)
+
+    @pytest.mark.asyncio
+    async def test_crawl_markdown_stream_yields_results_as_they_arrive(self, mock_openai_client: MagicMock) -> None:
+        """Test that streamed crawl results are yielded per URL and missing URLs are reported."""
+        # Arrange
+        service = ExtractorService(mock_openai_client)
+
+        async def stream() -> AsyncIterator[MagicMock]:
+            yield MagicMock(success=True, url="https://example.com/b", markdown="# B")
+
+        with (
+            patch("src.metadata_extraction.extractor_service._load_crawl4ai") as load_crawl4ai,
+            patch.object(service, "_create_browser_config"),
+            patch.object(service, "_create_run_config") as create_run_config,
+        ):
+            crawler = load_crawl4ai.return_value.AsyncWebCrawler.return_value.__aenter__.return_value
+            crawler.arun_many = AsyncMock(return_value=stream())
+            received: list[tuple[str, str]] = []
+
+            # Act & Assert
+            with pytest.raises(ExtractorServiceError, match="No crawl result returned for URLs: https://example.com/a"):
+                async for item in service._crawl_markdown_stream(["https://example.com/a", "https://example.com/b"], 2):
+                    received.append(item)
+
+        assert received == [("https://example.com/b", "# B")]
+        create_run_config.assert_called_once_with({"stream": True})
+
+    def test_extract_structured_metadata_reuses_cached_result(
+        self, mock_openai_client: MagicMock, title_only_schema: dict[str, Any]
+    ) -> None:
+        """Test that identical prompt/schema/model inputs only hit OpenAI once."""
+        # Arrange
+        mock_openai_client.get_structured_response.return_value = {"Job Title": "Engineer"}
+        service = ExtractorService(mock_openai_client)
+        openai_schema = create_openai_schema_from_notion_database(title_only_schema, True)
+
+        # Act
+        first = service._extract_structured_metadata("prompt", "gpt-4o", openai_schema)
+        first["Job Title"] = "mutated by caller"
+        second = service._extract_structured_metadata("prompt", "gpt-4o", openai_schema)
+        service._extract_structured_metadata("prompt", "gpt-4.1", openai_schema)
+
+        # Assert
+        assert second == {"Job Title": "Engineer"}
+        assert mock_openai_client.get_structured_response.call_count == 2
+
+    def test_extract_structured_metadata_reuses_disk_cache_across_instances(
+        self, mock_openai_client: MagicMock, title_only_schema: dict[str, Any], tmp_path: Path
+    ) -> None:
+        """Test that a result stored by one service instance is served from disk to the next."""
+        # Arrange
+        mock_openai_client.get_structured_response.return_value = {"Job Title": "Engineer"}
+        openai_schema = create_openai_schema_from_notion_database(title_only_schema, True)
+        cache_path = tmp_path / "responses.sqlite3"
+
+        # Act
+        first_service = ExtractorService(mock_openai_client, response_cache=ExtractionResponseCache(cache_path, 60, 10))
+        first_service._extract_structured_metadata("prompt", "gpt-4o", openai_schema)
+        first_service.close()
+        second_service = ExtractorService(
+            mock_openai_client, response_cache=ExtractionResponseCache(cache_path, 60, 10)
+        )
+        result = second_service._extract_structured_metadata("prompt", "gpt-4o", openai_schema)
+        second_service.close()
+
+        # Assert
+        assert result == {"Job Title": "Engineer"}
+        mock_openai_client.get_structured_response.assert_called_once()
+
+    def test_extraction_cache_key_depends_on_prompt_version(self) -> None:
+        """Test that bumping PROMPT_VERSION invalidates previously cached extractions."""
+        before = ExtractorService._extraction_cache_key("prompt", "gpt-4o", "schema-hash")
+
+        with patch("src.metadata_extraction.extractor_service.PROMPT_VERSION", "v-next"):
+            after = ExtractorService._extraction_cache_key("prompt", "gpt-4o", "schema-hash")
+
+        assert before != after
+        assert before == ExtractorService._extraction_cache_key("prompt", "gpt-4o", "schema-hash")
+
+    def test_extract_structured_metadata_rejects_output_not_matching_schema(
+        self, mock_openai_client: MagicMock, title_only_schema: dict[str, Any]
+    ) -> None:
+        """Test that LLM output violating the schema raises instead of being cached."""
+        # Arrange
+        mock_openai_client.get_structured_response.return_value = {"Job Title": 42}
+        service = ExtractorService(mock_openai_client)
+        openai_schema = create_openai_schema_from_notion_database(title_only_schema, True)
+
+        # Act & Assert
+        with pytest.raises(ExtractorServiceError, match="does not match the schema"):
+            service._extract_structured_metadata("prompt", "gpt-4o", openai_schema)
+        assert service._extraction_cache == {}
+
+    @pytest.mark.asyncio
+    async def test_extract_metadata_from_job_url_async(
+        self, mock_openai_client: MagicMock, title_only_schema: dict[str, Any]
+    ) -> None:
+        """Test that the async single-URL API crawls and extracts on the caller's loop."""
+        # Arrange
+        mock_openai_client.get_structured_response_async = AsyncMock(return_value={"Job Title": "Engineer"})
+        service = ExtractorService(mock_openai_client)
+
+        # Act
+        with (
+            patch.object(service, "_crawl_markdown_async", AsyncMock(return_value="# Job")) as crawl,
+            patch.object(service, "_prepare_extraction_prompt", side_effect=lambda md: f"prompt:{md}"),
+        ):
+            result = await service.extract_metadata_from_job_url_async(
+                "https://example.com/a", title_only_schema, "gpt-4o"
+            )
+
+        # Assert
+        assert result == {"Job Title": "Engineer"}
+        crawl.assert_awaited_once_with("https://example.com/a")
+        assert mock_openai_client.get_structured_response_async.call_args.kwargs["sys_prompt"] == "prompt:# Job"
+
+    def test_extract_metadata_from_job_urls_uses_thread_pool(
+        self, mock_openai_client: MagicMock, title_only_schema: dict[str, Any]
+    ) -> None:
+        """Test that the sync batch API extracts each unique URL once on worker threads."""
+        # Arrange
+        service = ExtractorService(mock_openai_client)
+        worker_threads: set[str] = set()
+
+        def fake_extract(url: str, schema: dict[str, Any], model_name: str) -> dict[str, Any]:
+            worker_threads.add(threading.current_thread().name)
+            return {"Job Title": url}
+
+        urls = ["https://example.com/a", "https://example.com/b", "https://example.com/a"]
+
+        # Act
+        with patch.object(service, "extract_metadata_from_job_url", side_effect=fake_extract) as extract:
+            result = service.extract_metadata_from_job_urls(urls, title_only_schema, "gpt-4o", 2)
+
+        # Assert
+        assert extract.call_count == 2
+        assert list(result) == ["https://example.com/a", "https://example.com/b"]
+        assert result["https://example.com/b"] == {"Job Title": "https://example.com/b"}
+        assert all(name.startswith("extract") for name in worker_threads)
+
+    def test_extract_metadata_from_job_urls_propagates_errors(
+        self, mock_openai_client: MagicMock, title_only_schema: dict[str, Any]
+    ) -> None:
+        """Test that a failing URL in the sync batch API raises its ExtractorServiceError."""
+        service = ExtractorService(mock_openai_client)
+
+        with patch.object(service, "extract_metadata_from_job_url", side_effect=ExtractorServiceError("boom")):
+            with pytest.raises(ExtractorServiceError, match="boom"):
+                service.extract_metadata_from_job_urls(["https://example.com/a"], title_only_schema, "gpt-4o", 1)
+
+    def test_extract_metadata_from_job_descriptions_batches_calls(
+        self, mock_openai_client: MagicMock, title_only_schema: dict[str, Any]
+    ) -> None:
+        """Test that descriptions are sent several per OpenAI call and cached one by one."""
+        # Arrange
+        mock_openai_client.get_structured_response.side_effect = [
+            {"jobs": [{"Job Title": "A"}, {"Job Title": "B"}]},
+            {"Job Title": "C"},
+        ]
+        service = ExtractorService(mock_openai_client)
+
+        # Act
+        result = service.extract_metadata_from_job_descriptions(["# A", "# B", "# C"], title_only_schema, "gpt-4o", 2)
+        again = service.extract_metadata_from_job_descriptions(["# B"], title_only_schema, "gpt-4o", 2)
+
+        # Assert
+        assert result == [{"Job Title": "A"}, {"Job Title": "B"}, {"Job Title": "C"}]
+        assert again == [{"Job Title": "B"}]
+        assert mock_openai_client.get_structured_response.call_count == 2
+        batch_call = mock_openai_client.get_structured_response.call_args_list[0].kwargs
+        assert "### Job 1\n# A" in batch_call["sys_prompt"]
+        assert "### Job 2\n# B" in batch_call["sys_prompt"]
+        assert batch_call["schema"]["properties"]["jobs"]["type"] == "array"
+        assert batch_call["use_history"] is False
+
+    def test_extract_metadata_from_job_descriptions_falls_back_on_length_mismatch(
+        self, mock_openai_client: MagicMock, title_only_schema: dict[str, Any]
+    ) -> None:
+        """Test that a batch answer with the wrong number of jobs is retried one description at a time."""
+        # Arrange
+        mock_openai_client.get_structured_response.side_effect = [
+            {"jobs": [{"Job Title": "A"}]},
+            {"Job Title": "A"},
+            {"Job Title": "B"},
+        ]
+        service = ExtractorService(mock_openai_client)
+
+        # Act
+        result = service.extract_metadata_from_job_descriptions(["# A", "# B"], title_only_schema, "gpt-4o", 5)
+
+        # Assert
+        assert result == [{"Job Title": "A"}, {"Job Title": "B"}]
+        assert mock_openai_client.get_structured_response.call_count == 3
+
+    def test_extract_metadata_from_job_descriptions_rejects_invalid_batch_size(
+        self, mock_openai_client: MagicMock, title_only_schema: dict[str, Any]
+    ) -> None:
+        """Test that a non-positive batch size is rejected before any OpenAI call."""
+        service = ExtractorService(mock_openai_client)
+
+        with pytest.raises(ExtractorServiceError, match="batch_size must be at least 1"):
+            service.extract_metadata_from_job_descriptions(["# A"], title_only_schema, "gpt-4o", 0)
+        mock_openai_client.get_structured_response.assert_not_called()
+
+    def test_extraction_batch_round_trip(
+        self, mock_openai_client: MagicMock, title_only_schema: dict[str, Any]
+    ) -> None:
+        """Test that batch submission keys prompts by position and retrieval drops invalid outputs."""
+        # Arrange
+        mock_openai_client.create_structured_batch.return_value = "batch_1"
+        mock_openai_client.get_structured_batch_results.side_effect = [
+            None,
+            {"1": {"Job Title": "B"}, "0": {"Job Title": 42}},
+        ]
+        service = ExtractorService(mock_openai_client)
+
+        # Act
+        batch_id = service.submit_extraction_batch(["# A", "# B"], title_only_schema, "gpt-4o")
+        with patch("src.metadata_extraction.extractor_service.time.sleep") as sleep:
+            result = service.retrieve_extraction_batch_results(
+                batch_id, title_only_schema, wait=True, poll_interval_seconds=5
+            )
+
+        # Assert
+        assert batch_id == "batch_1"
+        prompts, model_name, _ = mock_openai_client.create_structured_batch.call_args.args
+        assert list(prompts) == ["0", "1"]
+        assert "# B" in prompts["1"]
+        assert model_name == "gpt-4o"
+        assert result == {1: {"Job Title": "B"}}
+        sleep.assert_called_once_with(5)
+
+    def test_extract_metadata_from_job_url_coalesces_concurrent_calls(
+        self, mock_openai_client: MagicMock, title_only_schema: dict[str, Any]
+    ) -> None:
+        """Test that concurrent sync calls for the same URL share one extraction."""
+        # Arrange
+        service = ExtractorService(mock_openai_client)
+        second_caller_registered = threading.Event()
+
+        class RecordingLock:
+            """Lock that signals once the second caller has looked up the in-flight table."""
+
+            def __init__(self) -> None:
+                self._lock = threading.Lock()
+                self.acquisitions = 0
+
+            def __enter__(self) -> None:
+                self._lock.acquire()
+                self.acquisitions += 1
+
+            def __exit__(self, *args: object) -> None:
+                self._lock.release()
+                if self.acquisitions == 2:
+                    second_caller_registered.set()
+
+        service._inflight_lock = RecordingLock()  # type: ignore[assignment]
+
+        def slow_extract(job_url: str, openai_schema: Any, model_name: str) -> dict[str, Any]:
+            second_caller_registered.wait(timeout=5)
+            return {"Job Title": "Engineer"}
+
+        # Act
+        with patch.object(service, "_extract_metadata_with_crawl4ai", side_effect=slow_extract) as extract:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [
+                    executor.submit(
+                        service.extract_metadata_from_job_url, "https://example.com/a", title_only_schema, "gpt-4o"
+                    )
+                    for _ in range(2)
+                ]
+                results = [future.result() for future in futures]
+
+        # Assert
+        extract.assert_called_once()
+        assert results == [{"Job Title": "Engineer"}, {"Job Title": "Engineer"}]
+        assert results[0] is not results[1]
+        assert service._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_extract_metadata_from_job_url_async_coalesces_concurrent_calls(
+        self, mock_openai_client: MagicMock, title_only_schema: dict[str, Any]
+    ) -> None:
+        """Test that concurrent awaits for the same URL share one crawl and LLM call, including failures."""
+        # Arrange
+        service = ExtractorService(mock_openai_client)
+
+        async def slow_crawl(job_url: str) -> str:
+            await asyncio.sleep(0.01)
+            if job_url.endswith("/bad"):
+                raise RuntimeError("boom")
+            return "# Job"
+
+        mock_openai_client.get_structured_response_async = AsyncMock(return_value={"Job Title": "Engineer"})
+
+        # Act
+        with patch.object(service, "_crawl_markdown_async", side_effect=slow_crawl) as crawl:
+            results = await asyncio.gather(
+                service.extract_metadata_from_job_url_async("https://example.com/a", title_only_schema, "gpt-4o"),
+                service.extract_metadata_from_job_url_async("https://example.com/a", title_only_schema, "gpt-4o"),
+                service.extract_metadata_from_job_url_async("https://example.com/bad", title_only_schema, "gpt-4o"),
+                service.extract_metadata_from_job_url_async("https://example.com/bad", title_only_schema, "gpt-4o"),
+                return_exceptions=True,
+            )
+
+        # Assert
+        assert crawl.await_count == 2
+        mock_openai_client.get_structured_response_async.assert_awaited_once()
+        assert results[0] == results[1] == {"Job Title": "Engineer"}
+        assert isinstance(results[2], ExtractorServiceError)
+        assert results[3] is results[2]
+        assert service._inflight_async == {}
@@ -0,0 +1,59 @@
+"""Tests for the persistent extraction response cache."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.metadata_extraction.response_cache import ExtractionResponseCache
+
+
+class TestExtractionResponseCache:
+    """Test suite for ExtractionResponseCache."""
+
+    def test_put_and_get_round_trip(self, tmp_path: Path) -> None:
+        """Test that stored values are returned unchanged and unknown keys miss."""
+        cache = ExtractionResponseCache(tmp_path / "cache" / "responses.sqlite3", ttl_seconds=60, max_entries=10)
+
+        cache.put("key", {"Job Title": "Engineer", "Skills": ["Python"]})
+
+        assert cache.get("key") == {"Job Title": "Engineer", "Skills": ["Python"]}
+        assert cache.get("other") is None
+        cache.close()
+
+    def test_expired_entries_are_ignored(self, tmp_path: Path) -> None:
+        """Test that entries older than the TTL are treated as misses."""
+        cache = ExtractionResponseCache(tmp_path / "responses.sqlite3", ttl_seconds=60, max_entries=10)
+
+        with patch("src.metadata_extraction.response_cache.time.time", return_value=1000.0):
+            cache.put("key", {"Job Title": "Engineer"})
+        with patch("src.metadata_extraction.response_cache.time.time", return_value=1061.0):
+            assert cache.get("key") is None
+        cache.close()
+
+    def test_oldest_entries_are_evicted(self, tmp_path: Path) -> None:
+        """Test that only the newest max_entries values are kept."""
+        cache = ExtractionResponseCache(tmp_path / "responses.sqlite3", ttl_seconds=3600, max_entries=2)
+
+        for i, key in enumerate(("a", "b", "c")):
+            with patch("src.metadata_extraction.response_cache.time.time", return_value=1000.0 + i):
+                cache.put(key, {"value": key})
+
+        with patch("src.metadata_extraction.response_cache.time.time", return_value=1010.0):
+            assert cache.get("a") is None
+            assert cache.get("b") == {"value": "b"}
+            assert cache.get("c") == {"value": "c"}
+        cache.close()
+
+    def test_from_settings_respects_cache_enabled(self, tmp_path: Path) -> None:
+        """Test that the cache is built from the CACHE_* settings and disabled when CACHE_ENABLED is false."""
+        settings = MagicMock(CACHE_ENABLED=True, CACHE_DIRECTORY=tmp_path, CACHE_TTL_HOURS=2, CACHE_MAX_ENTRIES=5)
+
+        with patch("src.metadata_extraction.response_cache.get_settings", return_value=settings):
+            cache = ExtractionResponseCache.from_settings()
+            settings.CACHE_ENABLED = False
+            disabled = ExtractionResponseCache.from_settings()
+
+        assert cache is not None
+        assert cache.path.parent == tmp_path
+        assert cache.ttl_seconds == 7200
+        assert cache.max_entries == 5
+        assert disabled is None
@@ -1,14 +1,25 @@
 """Tests for metadata extraction models and conversion functions."""
 
+import copy
+from collections.abc import Generator
 from typing import Any
 from unittest.mock import patch
 
+import fastjsonschema  # type: ignore[import-untyped]
+import pytest
+
+from src.common.schemas.openai_schema import OpenAISchema
 from src.metadata_extraction.schema_utils import (
+    _OPENAI_SCHEMA_CACHE,
     _generate_example_description,
+    _get_notion_value_converters,
+    _parse_directives,
     _should_exclude_property,
     _should_keep_options,
     convert_openai_response_to_notion_update,
     create_openai_schema_from_notion_database,
+    dump_openai_schema,
+    get_openai_schema_validator,
     notion_property_to_openai_schema,
     openai_data_to_notion_property,
 )
@@ -50,21 +61,29 @@ class TestHelperFunctions:
         assert not _should_keep_options("normal description")
         assert not _should_keep_options("description with #other-directive")
 
-    @patch("src.metadata_extraction.schema_utils.random.sample")
-    def test_generate_example_description_with_options(self, mock_sample: Any) -> None:
-        """Test example description generation with options."""
-        options = [
-            {"name": "Option1", "id": "1"},
-            {"name": "Option2", "id": "2"},
-            {"name": "Option3", "id": "3"},
-        ]
-        mock_sample.return_value = options[:2]  # Return first 2 options
+    def test_parse_directives(self) -> None:
+        """Test that all directives are found in a single scan."""
+        assert _parse_directives("notes #exclude #keep-options") == {"exclude", "keep-options"}
+        assert _parse_directives("#keep-options only") == {"keep-options"}
+        assert _parse_directives("description with #other-directive") == frozenset()
+        assert _parse_directives("") == frozenset()
 
+    def test_generate_example_description_with_options(self) -> None:
+        """Test that examples are spread evenly over the options and stable across calls."""
+        options = [{"name": f"Option{i}", "id": str(i)} for i in range(1, 8)]
         prop_config: dict[str, Any] = {"select": {"options": options}}
+
         result = _generate_example_description(prop_config, "select")
 
+        assert result == "e.g. Option1, Option3, Option5, ..."
+        assert _generate_example_description(prop_config, "select") == result
+
+    def test_generate_example_description_few_options(self) -> None:
+        """Test that short option lists are used as they are."""
+        options = [{"name": "Option1", "id": "1"}, {"name": "Option2", "id": "2"}]
+        prop_config: dict[str, Any] = {"select": {"options": options}}
+        result = _generate_example_description(prop_config, "select")
         assert result == "e.g. Option1, Option2, ..."
-        mock_sample.assert_called_once_with(options, 3)  # Should sample min(3, len(options)) = 3
 
     def test_generate_example_description_empty_options(self) -> None:
         """Test example description generation with no options."""
@@ -175,7 +194,7 @@ class TestNotionPropertyToOpenAISchema:
     def test_url_property(self) -> None:
         notion_prop = {"type": "url"}
         result = notion_property_to_openai_schema(notion_prop, add_options=False)
-        assert result == {"type": "string", "pattern": r"^(https?)://[^\s/$.?#].[^\s]*$"}
+        assert result == {"type": "string", "pattern": r"^(https?)://[^\s/\$.?#].[^\s]*$"}
 
     def test_people_property(self) -> None:
         notion_prop = {"type": "people"}
@@ -192,6 +211,12 @@ class TestNotionPropertyToOpenAISchema:
         result = notion_property_to_openai_schema(notion_prop, add_options=False)
         assert result == {"type": "string"}
 
+    def test_static_property_description_does_not_leak(self) -> None:
+        described = notion_property_to_openai_schema({"type": "number", "description": "Salary"}, add_options=False)
+        plain = notion_property_to_openai_schema({"type": "number"}, add_options=False)
+        assert described == {"type": "number", "description": "Salary"}
+        assert plain == {"type": "number"}
+
 
 class TestOpenAIDataToNotionProperty:
     """Test conversion from OpenAI response data to Notion property values."""
@@ -296,6 +321,13 @@ class TestOpenAIDataToNotionProperty:
 class TestCreateOpenAISchemaFromNotionDatabase:
     """Test creating complete OpenAI JSON Schema from Notion database properties."""
 
+    @pytest.fixture(autouse=True)
+    def clear_schema_cache(self) -> Generator[None]:
+        """Isolate tests from schemas memoized by earlier tests."""
+        _OPENAI_SCHEMA_CACHE.clear()
+        yield
+        _OPENAI_SCHEMA_CACHE.clear()
+
     def test_create_schema_basic_properties(self) -> None:
         notion_properties = {
             "job_title": {"type": "title"},
@@ -406,7 +438,7 @@ class TestCreateOpenAISchemaFromNotionDatabase:
                 "status": {
                     "type": "string",
                     "enum": ["Todo", "In Progress", "Done"],
-                    "description": "Task status #keep-options",
+                    "description": "Task status",
                 }
             },
             "required": ["status"],
@@ -414,11 +446,23 @@ class TestCreateOpenAISchemaFromNotionDatabase:
         }
         assert result == expected
 
-    @patch("src.metadata_extraction.schema_utils.random.sample")
-    def test_create_schema_example_generation(self, mock_sample: Any) -> None:
-        """Test that examples are generated for select properties when options not included."""
-        mock_sample.return_value = [{"name": "Junior", "id": "1"}, {"name": "Senior", "id": "2"}]
+    def test_create_schema_strips_directive_only_description(self) -> None:
+        """Test that a description made only of directives is not sent to the LLM."""
+        notion_properties = {
+            "status": {
+                "type": "select",
+                "description": "#Keep-Options",
+                "select": {"options": [{"name": "Todo", "id": "1"}]},
+            }
+        }
+
+        result = create_openai_schema_from_notion_database(notion_properties, add_options=False).dict()
 
+        assert result["properties"]["status"] == {"type": "string", "enum": ["Todo"]}
+        assert notion_properties["status"]["description"] == "#Keep-Options"
+
+    def test_create_schema_example_generation(self) -> None:
+        """Test that examples are generated for select properties when options not included."""
         notion_properties = {
             "experience_level": {
                 "type": "select",
@@ -435,13 +479,10 @@ class TestCreateOpenAISchemaFromNotionDatabase:
 
         # Should generate example description
         assert "description" in result["properties"]["experience_level"]
-        assert "e.g. Junior, Senior, ..." in result["properties"]["experience_level"]["description"]
+        assert "e.g. Junior, Mid, Senior, ..." in result["properties"]["experience_level"]["description"]
 
-    @patch("src.metadata_extraction.schema_utils.random.sample")
-    def test_create_schema_preserve_original_description_with_examples(self, mock_sample: Any) -> None:
+    def test_create_schema_preserve_original_description_with_examples(self) -> None:
         """Test that original descriptions are preserved when adding examples."""
-        mock_sample.return_value = [{"name": "Low", "id": "1"}, {"name": "High", "id": "2"}]
-
         notion_properties = {
             "priority": {
                 "type": "select",
@@ -458,7 +499,7 @@ class TestCreateOpenAISchemaFromNotionDatabase:
         result = create_openai_schema_from_notion_database(notion_properties, add_options=False).dict()
 
         # Should combine original description with examples
-        expected_desc = "Task priority level | e.g. Low, High, ..."
+        expected_desc = "Task priority level | e.g. Low, Medium, High, ..."
         assert result["properties"]["priority"]["description"] == expected_desc
 
     def test_create_schema_multi_select_example_generation(self) -> None:
@@ -506,6 +547,25 @@ class TestCreateOpenAISchemaFromNotionDatabase:
         assert "e.g." in description
         assert "..." in description
 
+    @patch("src.metadata_extraction.schema_utils._generate_example_description", wraps=_generate_example_description)
+    def test_create_schema_is_cached_by_content(self, mock_generate: Any) -> None:
+        """Test that equal Notion schemas reuse the converted schema without mutating the input."""
+        notion_properties = {
+            "work_mode": {
+                "type": "select",
+                "description": "Where the job is done",
+                "select": {"options": [{"name": "Remote", "id": "1"}, {"name": "Onsite", "id": "2"}]},
+            }
+        }
+
+        first = create_openai_schema_from_notion_database(notion_properties, add_options=False)
+        second = create_openai_schema_from_notion_database(copy.deepcopy(notion_properties), add_options=False)
+
+        assert second is first
+        assert mock_generate.call_count == 1
+        assert notion_properties["work_mode"]["description"] == "Where the job is done"
+        assert first.properties["work_mode"]["description"] == "Where the job is done | e.g. Remote, Onsite, ..."
+
     def test_create_schema_mixed_directives_and_types(self) -> None:
         """Test complex scenario with mixed property types and directives."""
         notion_properties = {
@@ -628,6 +688,16 @@ class TestConvertOpenAIResponseToNotionUpdate:
         }
         assert result == expected
 
+    def test_convert_response_reuses_converters_per_schema(self) -> None:
+        notion_properties = {"job_title": {"type": "title"}, "salary": {"type": "number"}}
+        same_types = {"job_title": {"type": "title", "description": "Edited"}, "salary": {"type": "number"}}
+
+        converters = _get_notion_value_converters(notion_properties)
+
+        assert _get_notion_value_converters(copy.deepcopy(notion_properties)) is converters
+        assert _get_notion_value_converters(same_types) is converters
+        assert _get_notion_value_converters({"job_title": {"type": "rich_text"}}) is not converters
+
 
 class TestNotionPropertyToOpenAISchemaEnhanced:
     """Enhanced tests for notion_property_to_openai_schema function."""
@@ -639,6 +709,13 @@ class TestNotionPropertyToOpenAISchemaEnhanced:
         expected = {"type": "string", "maxLength": 2000, "description": "A detailed description of this field"}
         assert result == expected
 
+    def test_description_override(self) -> None:
+        """Test that an explicit description replaces the property's own one."""
+        notion_prop = {"type": "rich_text", "description": "Original #keep-options"}
+        result = notion_property_to_openai_schema(notion_prop, add_options=False, description_override="Override")
+        assert result["description"] == "Override"
+        assert notion_prop["description"] == "Original #keep-options"
+
     def test_select_with_empty_options_list(self) -> None:
         """Test select property with empty options list."""
         notion_prop = {"type": "select", "select": {"options": []}}
@@ -656,3 +733,64 @@ class TestNotionPropertyToOpenAISchemaEnhanced:
         notion_prop = {"type": "status", "status": {"options": []}}
         result = notion_property_to_openai_schema(notion_prop, add_options=True)
         assert result == {"type": "string"}
+
+
+class TestGetOpenAISchemaValidator:
+    """Test compiled validators for OpenAI JSON schemas."""
+
+    def test_validator_is_compiled_once_per_schema(self) -> None:
+        schema = {
+            "type": "object",
+            "properties": {"level": {"type": "string", "enum": ["Junior", "Senior"]}},
+            "required": ["level"],
+            "additionalProperties": False,
+        }
+
+        validator = get_openai_schema_validator(schema)
+
+        assert get_openai_schema_validator(dict(schema)) is validator
+        validator({"level": "Junior"})
+        with pytest.raises(fastjsonschema.JsonSchemaValueException):
+            validator({"level": "Principal"})
+
+    def test_validator_compiles_generated_property_schemas(self) -> None:
+        notion_properties = {
+            name: {"type": name}
+            for name in ("title", "rich_text", "number", "checkbox", "date", "email", "phone_number", "url", "files")
+        }
+        schema = create_openai_schema_from_notion_database(notion_properties, add_options=True).dict()
+
+        valid = {
+            "title": "Engineer",
+            "rich_text": "text",
+            "number": 1,
+            "checkbox": True,
+            "date": "2024-01-01",
+            "email": "a@b.co",
+            "phone_number": "+1",
+            "url": "https://example.com/jobs/1",
+            "files": [],
+        }
+
+        validator = get_openai_schema_validator(schema)
+
+        validator(valid)
+        with pytest.raises(fastjsonschema.JsonSchemaValueException, match="url"):
+            validator({**valid, "url": "not a url"})
+
+
+class TestDumpOpenAISchema:
+    """Test the per-instance dict/hash memo for OpenAI schemas."""
+
+    def test_dump_is_computed_once_per_instance(self) -> None:
+        openai_schema = OpenAISchema(properties={"Title": {"type": "string"}}, required=["Title"])
+
+        with patch.object(type(openai_schema), "model_dump", wraps=openai_schema.model_dump) as model_dump:
+            schema, schema_key = dump_openai_schema(openai_schema)
+            again, again_key = dump_openai_schema(openai_schema)
+
+        assert model_dump.call_count == 1
+        assert again is schema
+        assert again_key == schema_key
+        assert schema == openai_schema.dict()
+        assert get_openai_schema_validator(schema, schema_key) is get_openai_schema_validator(dict(schema))
@@ -1,7 +1,11 @@
 import tempfile
+import threading
 from pathlib import Path
+from typing import BinaryIO
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 # Import the module under test
 from src.core.config import Settings
 from src.resume_tailoring.latex_service import LatexService
@@ -16,6 +20,7 @@ def make_settings(tmp_path: Path) -> Settings:
     class TestSettings(Settings):
         DEFAULT_OUTPUT_DIR: Path = tmp_path
         LATEXDIFF_COMMAND: str = "latexdiff"
+        CACHE_DIRECTORY: Path = tmp_path / ".cache"
 
     return TestSettings(
         OPENAI_API_KEY="test_openai_key_123",
@@ -45,13 +50,22 @@ def test_compile_resume(tmp_path: Path) -> None:
     service = LatexService(DummyPDFCompiler(), settings)  # type: ignore[arg-type]
     tex_path = tmp_path / "resume2.tex"
     tex_path.write_text("\\documentclass{article}\\begin{document}Test\\end{document}")
-    # Create the dummy PDF file at the expected output location
-    build_dir = tmp_path / "latex_build"
-    build_dir.mkdir(exist_ok=True)
-    dummy_pdf_path = build_dir / "resume2.pdf"
-    dummy_pdf_path.write_bytes(b"%PDF-1.4 dummy content")
-    pdf_path = service.compile_resume(tex_path)
+    build_dirs: list[Path] = []
+
+    def fake_compile(tex_file_path: Path, output_directory: Path) -> Path:
+        build_dirs.append(output_directory)
+        (output_directory / "resume2.aux").write_text("aux")
+        dummy_pdf_path = output_directory / "resume2.pdf"
+        dummy_pdf_path.write_bytes(b"%PDF-1.4 dummy content")
+        return dummy_pdf_path
+
+    with patch.object(service.pdf_compiler, "compile_tex_to_pdf", side_effect=fake_compile):
+        pdf_path = service.compile_resume(tex_path)
     assert pdf_path == tex_path.parent / "resume2.pdf"
+    assert pdf_path.read_bytes() == b"%PDF-1.4 dummy content"
+    assert build_dirs[0].parent != tmp_path
+    assert not build_dirs[0].exists()  # aux files are discarded with the build directory
+    assert not (tmp_path / "latex_build").exists()
 
 
 def test_run_latexdiff_success(tmp_path: Path) -> None:
@@ -62,8 +76,12 @@ def test_run_latexdiff_success(tmp_path: Path) -> None:
     output_dir = tmp_path / "output"
     orig.write_text("A")
     tailored.write_text("B")
-    with patch("subprocess.run") as mock_run:
-        mock_run.return_value = MagicMock(stdout="DIFF_CONTENT", returncode=0)
+
+    def fake_run(cmd: list[str], stdout: BinaryIO, **kwargs: object) -> MagicMock:
+        stdout.write(b"DIFF_CONTENT")
+        return MagicMock(returncode=0)
+
+    with patch("subprocess.run", side_effect=fake_run):
         diff_path = service.run_latexdiff(orig, tailored, "diff1", output_dir)
         assert diff_path is not None
         assert diff_path.exists()
@@ -82,3 +100,122 @@ def test_run_latexdiff_failure(tmp_path: Path) -> None:
     with patch("subprocess.run", side_effect=Exception("fail")):
         diff_path = service.run_latexdiff(orig, tailored, "diff2", output_dir)
         assert diff_path is None
+        assert not (output_dir / "diff2.tex").exists()
+
+
+@pytest.mark.asyncio
+async def test_compile_resumes_async_runs_concurrently_in_order(tmp_path: Path) -> None:
+    settings = make_settings(tmp_path)
+    service = LatexService(DummyPDFCompiler(), settings)  # type: ignore[arg-type]
+    tex_paths = [tmp_path / f"resume{i}.tex" for i in range(3)]
+    both_started = threading.Barrier(2, timeout=5)
+
+    def fake_compile(tex_file_path: Path) -> Path:
+        if tex_file_path != tex_paths[2]:
+            both_started.wait()  # only returns once two compilations are running at the same time
+        return tex_file_path.with_suffix(".pdf")
+
+    with patch.object(service, "compile_resume", side_effect=fake_compile):
+        result = await service.compile_resumes_async(tex_paths, max_concurrency=2)
+
+    assert result == [path.with_suffix(".pdf") for path in tex_paths]
+
+
+def test_get_pdf_page_count_parses_pdfinfo_output(tmp_path: Path) -> None:
+    settings = make_settings(tmp_path)
+    service = LatexService(DummyPDFCompiler(), settings)  # type: ignore[arg-type]
+    pdf_path = tmp_path / "resume.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4")
+    stdout = b"Title:          Resume\nProducer:       pdfTeX\nPages:          2\nPage size:      612 x 792 pts\n"
+
+    with patch("subprocess.run", return_value=MagicMock(stdout=stdout)) as mock_run:
+        assert service.get_pdf_page_count(pdf_path) == 2
+        assert service.get_pdf_page_count(pdf_path) == 2
+    mock_run.assert_called_once()  # The unchanged PDF is not inspected again
+
+    pdf_path.write_bytes(b"%PDF-1.4 rewritten")
+    with patch("subprocess.run", return_value=MagicMock(stdout=b"Title: Resume\n")):
+        with pytest.raises(RuntimeError, match="Could not find page count"):
+            service.get_pdf_page_count(pdf_path)
+
+
+def test_get_text_per_page_runs_pdftotext_once(tmp_path: Path) -> None:
+    settings = make_settings(tmp_path)
+    service = LatexService(DummyPDFCompiler(), settings)  # type: ignore[arg-type]
+    pdf_path = tmp_path / "cached.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4")
+
+    with patch("subprocess.run", return_value=MagicMock(stdout="first page\n\x0csecond page\n\x0c")) as mock_run:
+        assert service.get_text_per_page(pdf_path) == ["first page\n", "second page\n"]
+        assert service.get_text_from_pdf_page(pdf_path, 2) == "second page\n"
+        assert service.get_text_from_pdf_page(pdf_path, 3) is None
+
+    mock_run.assert_called_once()
+    assert mock_run.call_args.args[0] == ["pdftotext", str(pdf_path), "-"]
+
+
+def test_prepare_format_only_logs_failures(tmp_path: Path) -> None:
+    settings = make_settings(tmp_path)
+    compiler = MagicMock()
+    service = LatexService(compiler, settings)
+    tex_path = tmp_path / "master.tex"
+
+    service.prepare_format(tex_path)
+    compiler.ensure_format.assert_called_once_with(tex_path)
+
+    compiler.ensure_format.side_effect = FileNotFoundError("master.tex")
+    service.prepare_format(tex_path)  # Does not raise: compiling falls back to the regular path
+
+
+def test_compile_resume_reuses_pdf_of_identical_tex(tmp_path: Path) -> None:
+    settings = make_settings(tmp_path)
+    settings.CACHE_MAX_ENTRIES = 1
+    service = LatexService(DummyPDFCompiler(), settings)  # type: ignore[arg-type]
+    tex_path = tmp_path / "cached_resume.tex"
+
+    def fake_compile(tex_file_path: Path, output_directory: Path) -> Path:
+        pdf_path = output_directory / "cached_resume.pdf"
+        pdf_path.write_bytes(b"%PDF " + tex_file_path.read_bytes())
+        return pdf_path
+
+    with patch.object(service.pdf_compiler, "compile_tex_to_pdf", side_effect=fake_compile) as mock_compile:
+        tex_path.write_text("first")
+        service.compile_resume(tex_path)
+        tex_path.with_suffix(".pdf").unlink()
+        assert service.compile_resume(tex_path).read_bytes() == b"%PDF first"
+        assert mock_compile.call_count == 1
+
+        tex_path.write_text("second")
+        assert service.compile_resume(tex_path).read_bytes() == b"%PDF second"
+        assert mock_compile.call_count == 2
+
+    # Only the most recent PDF is kept with CACHE_MAX_ENTRIES=1
+    assert [path.read_bytes() for path in (tmp_path / ".cache" / "pdf").iterdir()] == [b"%PDF second"]
+
+
+@pytest.mark.parametrize("shm_available", [True, False])
+def test_compile_resume_builds_in_shared_memory_when_available(tmp_path: Path, shm_available: bool) -> None:
+    settings = make_settings(tmp_path)
+    settings.CACHE_ENABLED = False
+    service = LatexService(DummyPDFCompiler(), settings)  # type: ignore[arg-type]
+    tex_path = tmp_path / "shm_resume.tex"
+    tex_path.write_text("content")
+    shm = tmp_path / "shm"
+    shm.mkdir()
+    build_dirs: list[Path] = []
+
+    def fake_compile(tex_file_path: Path, output_directory: Path) -> Path:
+        build_dirs.append(output_directory)
+        pdf_path = output_directory / "shm_resume.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4")
+        return pdf_path
+
+    with (
+        patch(
+            "src.resume_tailoring.latex_service._shared_memory_directory", return_value=shm if shm_available else None
+        ),
+        patch.object(service.pdf_compiler, "compile_tex_to_pdf", side_effect=fake_compile),
+    ):
+        service.compile_resume(tex_path)
+
+    assert (build_dirs[0].parent == shm) is shm_available
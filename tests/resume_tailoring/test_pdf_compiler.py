@@ -1,3 +1,4 @@
+import subprocess
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -23,7 +24,7 @@ def test_compile_tex_to_pdf_success(monkeypatch: pytest.MonkeyPatch, minimal_tex
     output_dir = tmp_path / "output"
     pdf_path = output_dir / "test_resume.pdf"
 
-    def fake_run(cmd: str | list[str], shell: bool, capture_output: bool, cwd: str, **kwargs: object) -> MagicMock:
+    def fake_run(cmd: str | list[str], **kwargs: object) -> MagicMock:
         # Simulate pdflatex success by creating the PDF file
         output_dir.mkdir(exist_ok=True)
         pdf_path.write_bytes(b"%PDF-1.4 fake pdf content")
@@ -36,7 +37,7 @@ def test_compile_tex_to_pdf_success(monkeypatch: pytest.MonkeyPatch, minimal_tex
         result = compiler.compile_tex_to_pdf(minimal_tex_file, output_dir)
         assert result == pdf_path
         assert pdf_path.exists()
-        assert mock_run.call_count == 2  # Should run twice
+        assert mock_run.call_count == 1  # No cross-references: a single pass is enough
         # Check that the command includes the correct output directory and tex file
         called_args = mock_run.call_args[0][0]
         assert str(output_dir) in str(called_args)
@@ -46,16 +47,19 @@ def test_compile_tex_to_pdf_success(monkeypatch: pytest.MonkeyPatch, minimal_tex
 def test_compile_tex_to_pdf_failure(monkeypatch: pytest.MonkeyPatch, minimal_tex_file: Path, tmp_path: Path) -> None:
     output_dir = tmp_path / "output"
 
-    def fake_run(cmd: str, shell: bool, capture_output: bool, cwd: str, **kwargs: object) -> MagicMock:
+    def fake_run(cmd: str, **kwargs: object) -> MagicMock:
+        (output_dir / "test_resume.log").write_text("This is pdfTeX\n! Undefined control sequence.\nl.3 \\foo\n")
         mock_result = MagicMock()
         mock_result.returncode = 1
+        mock_result.stderr = b""
         return mock_result
 
-    with patch("subprocess.run", side_effect=fake_run):
+    with patch("subprocess.run", side_effect=fake_run) as mock_run:
         compiler = PDFCompiler()
-        with pytest.raises(PDFCompilationError):
+        with pytest.raises(PDFCompilationError, match="Undefined control sequence"):
             compiler.compile_tex_to_pdf(minimal_tex_file, output_dir)
         assert not (output_dir / "test_resume.pdf").exists()
+        assert mock_run.call_args.kwargs["stdout"] == subprocess.DEVNULL  # The log is read from disk instead
 
 
 def test_compile_tex_to_pdf_with_command_template(
@@ -64,7 +68,7 @@ def test_compile_tex_to_pdf_with_command_template(
     output_dir = tmp_path / "output"
     pdf_path = output_dir / "test_resume.pdf"
 
-    def fake_run(cmd: str | list[str], shell: bool, capture_output: bool, cwd: str, **kwargs: object) -> MagicMock:
+    def fake_run(cmd: str | list[str], **kwargs: object) -> MagicMock:
         output_dir.mkdir(exist_ok=True)
         pdf_path.write_bytes(b"%PDF-1.4 fake pdf content")
         mock_result = MagicMock()
@@ -72,13 +76,125 @@ def test_compile_tex_to_pdf_with_command_template(
         return mock_result
 
     with patch("subprocess.run", side_effect=fake_run) as mock_run:
-        template = "pdflatex -output-directory=%OUTDIR% %DOC%"
+        template = "pdflatex -jobname='test_resume' -output-directory=%OUTDIR% %DOC%"
         compiler = PDFCompiler(command_template=template)
         result = compiler.compile_tex_to_pdf(minimal_tex_file, output_dir)
         assert result == pdf_path
         assert pdf_path.exists()
-        assert mock_run.call_count == 2
-        called_cmd = mock_run.call_args[0][0]
-        # called_cmd is a string, so just check substring
-        assert str(output_dir) in str(called_cmd)
-        assert str(minimal_tex_file) in str(called_cmd)
+        assert mock_run.call_count == 1
+        # The template is split once with shell quoting rules and run without a shell
+        assert mock_run.call_args[0][0] == [
+            "pdflatex",
+            "-jobname=test_resume",
+            f"-output-directory={output_dir}",
+            str(minimal_tex_file),
+        ]
+        assert "shell" not in mock_run.call_args.kwargs
+
+
+@pytest.mark.parametrize(("body", "expected_runs"), [(r"\section{A}\label{sec} See \ref{sec}.", 2), ("Hello", 1)])
+def test_compile_tex_to_pdf_reruns_only_for_cross_references(tmp_path: Path, body: str, expected_runs: int) -> None:
+    tex_file = tmp_path / "refs.tex"
+    tex_file.write_text(rf"\documentclass{{article}}\begin{{document}}{body}\end{{document}}")
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    def fake_run(cmd: list[str], **kwargs: object) -> MagicMock:
+        (output_dir / "refs.pdf").write_bytes(b"%PDF-1.4 fake pdf content")
+        return MagicMock(returncode=0, stderr=b"")
+
+    with patch("subprocess.run", side_effect=fake_run) as mock_run:
+        PDFCompiler().compile_tex_to_pdf(tex_file, output_dir)
+
+    assert mock_run.call_count == expected_runs
+
+
+def test_compile_tex_to_pdf_reruns_when_latex_asks(minimal_tex_file: Path, tmp_path: Path) -> None:
+    output_dir = tmp_path / "output"
+
+    def fake_run(cmd: list[str], **kwargs: object) -> MagicMock:
+        output_dir.mkdir(exist_ok=True)
+        (output_dir / "test_resume.pdf").write_bytes(b"%PDF-1.4 fake pdf content")
+        (output_dir / "test_resume.log").write_text("LaTeX Warning: Label(s) may have changed. Rerun to get it right.")
+        return MagicMock(returncode=0, stderr=b"")
+
+    with patch("subprocess.run", side_effect=fake_run) as mock_run:
+        PDFCompiler().compile_tex_to_pdf(minimal_tex_file, output_dir)
+
+    assert mock_run.call_count == 2
+
+
+def test_compile_tex_to_pdf_reuses_dumped_preamble_format(minimal_tex_file: Path, tmp_path: Path) -> None:
+    output_dir = tmp_path / "output"
+    format_dir = tmp_path / "formats"
+    commands: list[list[str]] = []
+
+    def fake_run(cmd: list[str], **kwargs: object) -> MagicMock:
+        commands.append(cmd)
+        if "-ini" in cmd:
+            jobname = next(arg for arg in cmd if arg.startswith("-jobname=")).removeprefix("-jobname=")
+            (format_dir / f"{jobname}.fmt").write_bytes(b"fmt")
+        else:
+            (output_dir / "test_resume.pdf").write_bytes(b"%PDF-1.4")
+        return MagicMock(returncode=0, stdout="")
+
+    compiler = PDFCompiler(format_directory=format_dir)
+    with patch("subprocess.run", side_effect=fake_run):
+        compiler.compile_tex_to_pdf(minimal_tex_file, output_dir)
+        compiler.compile_tex_to_pdf(minimal_tex_file, output_dir)
+
+    assert [("-ini" in cmd) for cmd in commands] == [True, False, False]  # Dumped once, then reused
+    fmt_path = next(format_dir.glob("preamble-*.fmt"))
+    assert commands[1][1] == f"-fmt={fmt_path.with_suffix('')}"
+    assert "mylatexformat.ltx" in commands[0]
+
+
+def test_compile_tex_to_pdf_falls_back_when_format_fails(minimal_tex_file: Path, tmp_path: Path) -> None:
+    output_dir = tmp_path / "output"
+    format_dir = tmp_path / "formats"
+    commands: list[list[str]] = []
+
+    def fake_run(cmd: list[str], **kwargs: object) -> MagicMock:
+        commands.append(cmd)
+        if "-ini" in cmd:
+            jobname = next(arg for arg in cmd if arg.startswith("-jobname=")).removeprefix("-jobname=")
+            (format_dir / f"{jobname}.fmt").write_bytes(b"fmt")
+            return MagicMock(returncode=0, stdout="")
+        if any(arg.startswith("-fmt=") for arg in cmd):
+            return MagicMock(returncode=1, stdout="! Undefined control sequence.")
+        (output_dir / "test_resume.pdf").write_bytes(b"%PDF-1.4")
+        return MagicMock(returncode=0, stdout="")
+
+    compiler = PDFCompiler(format_directory=format_dir)
+    with patch("subprocess.run", side_effect=fake_run):
+        assert compiler.compile_tex_to_pdf(minimal_tex_file, output_dir) == output_dir / "test_resume.pdf"
+        compiler.compile_tex_to_pdf(minimal_tex_file, output_dir)
+
+    # The format is dropped after its first failure instead of being retried on every compile
+    assert sum(any(arg.startswith("-fmt=") for arg in cmd) for cmd in commands) == 1
+    assert len(commands) == 4
+
+
+def test_compile_tex_to_pdf_keeps_format_on_document_errors(minimal_tex_file: Path, tmp_path: Path) -> None:
+    output_dir = tmp_path / "output"
+    format_dir = tmp_path / "formats"
+    commands: list[list[str]] = []
+
+    def fake_run(cmd: list[str], **kwargs: object) -> MagicMock:
+        commands.append(cmd)
+        if "-ini" in cmd:
+            jobname = next(arg for arg in cmd if arg.startswith("-jobname=")).removeprefix("-jobname=")
+            (format_dir / f"{jobname}.fmt").write_bytes(b"fmt")
+            return MagicMock(returncode=0, stdout="")
+        (output_dir / "test_resume.log").write_bytes(b"! Undefined control sequence.\nl.3 \\itme\n")
+        return MagicMock(returncode=1, stderr=b"")
+
+    compiler = PDFCompiler(format_directory=format_dir)
+    with patch("subprocess.run", side_effect=fake_run):
+        with pytest.raises(PDFCompilationError, match="Undefined control sequence"):
+            compiler.compile_tex_to_pdf(minimal_tex_file, output_dir)
+        with pytest.raises(PDFCompilationError):
+            compiler.compile_tex_to_pdf(minimal_tex_file, output_dir)
+
+    # A LaTeX error in the body is not blamed on the format: no recompile, and it stays in use
+    assert [any(arg.startswith("-fmt=") for arg in cmd) for cmd in commands] == [False, True, True]
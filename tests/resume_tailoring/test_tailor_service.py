@@ -0,0 +1,201 @@
+import asyncio
+import threading
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.resume_tailoring.tailor_service import (
+    DIFF_PAT,
+    DiffBlockNotFoundError,
+    TailorService,
+    apply_diff,
+    find_source_snippet,
+    parse_diff_blocks,
+)
+
+
+def make_settings(tmp_path: Path) -> MagicMock:
+    return MagicMock(
+        PROMPTS_DIRECTORY=tmp_path,
+        BASE_OUTPUT_DIR=tmp_path / "output",
+        DEV_MODE=True,
+        DIFF_MAX_RETRIES=1,
+        DEFAULT_MODEL_NAME="gpt-4.1",
+        MASTER_RESUME_PATH=tmp_path / "master.tex",
+        TAILORED_RESUME_STEM="tailored_resume",
+        TAILORED_RESUME_DIFF_STEM="tailored_resume_diff",
+        TAILORED_RESUME_PROPERTY_NAME="Resume",
+    )
+
+
+@pytest.mark.asyncio
+async def test_tailor_resume_builds_diff_while_uploading_tailored_pdf(tmp_path: Path) -> None:
+    output_dir = tmp_path / "output"
+    tailored_tex = output_dir / "tailored_resume.tex"
+    diff_tex = output_dir / "tailored_resume_diff.tex"
+    diff_pdf = output_dir / "tailored_resume_diff.pdf"
+    events: list[str] = []
+    diff_started = threading.Event()
+
+    def save_tex_file(content: str, filename_stem: str, target_directory: Path) -> Path:
+        tailored_tex.write_text(content)
+        return tailored_tex
+
+    def compile_resume(tex_file_path: Path) -> Path:
+        pdf_path = tex_file_path.with_suffix(".pdf")
+        pdf_path.write_bytes(b"%PDF-1.4")
+        events.append(f"compile {pdf_path.name}")
+        return pdf_path
+
+    async def compile_resume_async(tex_file_path: Path) -> Path:
+        return compile_resume(tex_file_path)
+
+    def run_latexdiff(**kwargs: Any) -> Path:
+        events.append("latexdiff")
+        diff_tex.write_text("diff")
+        diff_started.set()
+        return diff_tex
+
+    async def upload_file_to_page(file_path: str, page_id: str, property_name: str, **kwargs: Any) -> None:
+        if kwargs.get("replace_existing"):
+            # Like the real Notion client, block the event loop; only returns if the diff is built in
+            # another thread while this upload is in flight
+            assert diff_started.wait(timeout=5)
+        events.append(f"upload {Path(file_path).name}")
+
+    latex_service = MagicMock()
+    latex_service.save_tex_file.side_effect = save_tex_file
+    latex_service.compile_resume.side_effect = compile_resume
+    latex_service.compile_resume_async = AsyncMock(side_effect=compile_resume_async)
+    latex_service.run_latexdiff.side_effect = run_latexdiff
+    latex_service.get_pdf_page_count.return_value = 1
+    notion_service = MagicMock()
+    notion_service.upload_file_to_page = AsyncMock(side_effect=upload_file_to_page)
+    openai_service = MagicMock()
+    openai_service.get_response.return_value = "no changes"
+    service = TailorService(openai_service, latex_service, notion_service)
+
+    with (
+        patch("src.resume_tailoring.tailor_service.get_settings", return_value=make_settings(tmp_path)),
+        patch("src.resume_tailoring.tailor_service.read_prompt_template", return_value="{tex_master_resume}"),
+    ):
+        await asyncio.wait_for(service.tailor_resume({"title": "Engineer"}, "master tex", "page-id"), timeout=5)
+
+    assert events[:2] == ["compile tailored_resume.pdf", "latexdiff"]
+    # The tailored PDF replaces the property's files before the diff PDF is appended
+    assert events.index("upload tailored_resume.pdf") < events.index("upload tailored_resume_diff.pdf")
+    assert diff_pdf.exists()
+    latex_service.prepare_format.assert_called_once_with(tmp_path / "master.tex")
+
+
+def test_apply_diff_replaces_first_occurrence_of_each_block() -> None:
+    src = "\\item Python\n\\item Go\n\\item Python\n"
+    diff = (
+        ">>>>>>> SEARCH\n\\item Python\n=======\n\\item Python 3\n<<<<<<< REPLACE\n"
+        ">>>>>>> SEARCH\n\\item Go\n=======\n\\item Rust\n<<<<<<< REPLACE\n"
+    )
+    assert apply_diff(src, diff) == "\\item Python 3\n\\item Rust\n\\item Python\n"
+
+
+def test_apply_diff_raises_on_missing_search_block() -> None:
+    diff = ">>>>>>> SEARCH\n\\item Java\n=======\n\\item Kotlin\n<<<<<<< REPLACE"
+    with pytest.raises(DiffBlockNotFoundError, match="Search block not found") as exc_info:
+        apply_diff("\\item Python\n", diff)
+    assert (exc_info.value.search, exc_info.value.replace) == ("\\item Java", "\\item Kotlin")
+
+
+def test_apply_diff_prepends_pure_insertions() -> None:
+    diff = ">>>>>>> SEARCH\n<<EMPTY>>\n=======\n% tailored\n<<<<<<< REPLACE"
+    assert apply_diff("body", diff) == "% tailored\n<<EMPTY>>body"
+
+
+@pytest.mark.parametrize(
+    "diff",
+    [
+        ">>>>>>> SEARCH\na\n=======\nb\n<<<<<<< REPLACE\ntext\n>>>>>>> SEARCH\nc\n=======\n\n<<<<<<< REPLACE",
+        # The first block has no closing marker: the regex fallback decides where blocks end
+        ">>>>>>> SEARCH\na\n=======\nb\n>>>>>>> SEARCH\nc\n=======\nd\n<<<<<<< REPLACE",
+        "no blocks at all",
+    ],
+)
+def test_parse_diff_blocks_matches_regex(diff: str) -> None:
+    assert parse_diff_blocks(diff) == [(match.group(1), match.group(2)) for match in DIFF_PAT.finditer(diff)]
+
+
+@pytest.mark.parametrize(("page_two_text", "llm_calls"), [("\n  Hobbies\n\x0c", 0), ("x" * 500, 1)])
+def test_reduce_pdf_fixes_trivial_overflow_without_llm(tmp_path: Path, page_two_text: str, llm_calls: int) -> None:
+    settings = make_settings(tmp_path)
+    settings.TRIVIAL_OVERFLOW_MAX_CHARS = 80
+    settings.PDF_REDUCTION_MAX_RETRIES = 1
+    settings.GOAL_PAGE_COUNT = 1
+    saved: list[str] = []
+
+    def save_tex_file(content: str, filename_stem: str, target_directory: Path) -> Path:
+        saved.append(content)
+        return tmp_path / "tailored_resume.tex"
+
+    latex_service = MagicMock()
+    latex_service.get_text_from_pdf_page.return_value = page_two_text
+    latex_service.save_tex_file.side_effect = save_tex_file
+    latex_service.compile_resume.return_value = tmp_path / "tailored_resume.pdf"
+    latex_service.get_pdf_page_count.return_value = 1
+    openai_service = MagicMock()
+    openai_service.get_response.return_value = "no changes"
+    service = TailorService(openai_service, latex_service, MagicMock())
+
+    with (
+        patch("src.resume_tailoring.tailor_service.get_settings", return_value=settings),
+        patch("src.resume_tailoring.tailor_service.read_prompt_template", return_value="{current_tex_content}"),
+    ):
+        content, _ = service._reduce_pdf_to_one_page(
+            current_tex_content="\\begin{document}\nbody\n\\end{document}",
+            current_pdf_path=tmp_path / "tailored_resume.pdf",
+            initial_page_count=2,
+            target_output_dir=tmp_path,
+        )
+
+    assert openai_service.get_response.call_count == llm_calls
+    if llm_calls == 0:
+        assert content == "\\begin{document}\n\\enlargethispage{2\\baselineskip}\nbody\n\\end{document}"
+        assert saved == [content]
+
+
+def test_find_source_snippet_locates_near_miss() -> None:
+    src = "\\section{Skills}\n\\item Python, Go\n\\item Docker\n\\section{Hobbies}\n"
+    assert find_source_snippet(src, "\\item Python,Go", context_lines=0) == "\\item Python, Go"
+    assert find_source_snippet(src, "completely unrelated text") is None
+
+
+def test_repair_diff_replaces_only_failed_block(tmp_path: Path) -> None:
+    settings = make_settings(tmp_path)
+    settings.DIFF_REPAIR_MODEL_NAME = "gpt-4.1-mini"
+    src = "\\item Python, Go\n\\item Docker\n"
+    diff = (
+        ">>>>>>> SEARCH\n\\item Docker\n=======\n\\item Kubernetes\n<<<<<<< REPLACE\n"
+        ">>>>>>> SEARCH\n\\item Python,Go\n=======\n\\item Python, Rust\n<<<<<<< REPLACE"
+    )
+    with pytest.raises(DiffBlockNotFoundError) as exc_info:
+        apply_diff(src, diff)
+    openai_service = MagicMock()
+    openai_service.get_response.return_value = (
+        "***BEGIN_DIFF\n>>>>>>> SEARCH\n\\item Python, Go\n=======\n\\item Python, Rust\n<<<<<<< REPLACE\n***END_DIFF"
+    )
+    service = TailorService(openai_service, MagicMock(), MagicMock())
+
+    with (
+        patch("src.resume_tailoring.tailor_service.get_settings", return_value=settings),
+        patch(
+            "src.resume_tailoring.tailor_service.read_prompt_template",
+            return_value="{failed_block}\n{source_snippet}",
+        ),
+    ):
+        repaired = service._repair_diff(diff, exc_info.value, src)
+
+    assert repaired is not None
+    assert apply_diff(src, repaired) == "\\item Python, Rust\n\\item Kubernetes\n"
+    kwargs = openai_service.get_response.call_args.kwargs
+    assert kwargs["model_name"] == "gpt-4.1-mini"
+    assert kwargs["use_history"] is False
+    assert "\\item Python,Go" in kwargs["user_prompt"]
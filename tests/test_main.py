@@ -99,7 +99,9 @@ class TestMain:
             "company": "Tech Corp",
             "salary": 100000,
         }
-        mock_extractor_service_instance.extract_metadata_from_job_url.return_value = mock_extracted_metadata
+        mock_extractor_service_instance.extract_metadata_from_job_url_async = AsyncMock(
+            return_value=mock_extracted_metadata
+        )
         mock_extractor_service.return_value = mock_extractor_service_instance
 
         # Execute main function
@@ -112,7 +114,7 @@ class TestMain:
         mock_extractor_service.assert_called_once()
 
         mock_notion_service_instance.get_database_schema.assert_called_once()
-        mock_extractor_service_instance.extract_metadata_from_job_url.assert_called_once_with(
+        mock_extractor_service_instance.extract_metadata_from_job_url_async.assert_awaited_once_with(
             "https://example.com/job",
             mock_database_schema,
             "gpt-4o",